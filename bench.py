@@ -0,0 +1,267 @@
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass
+from importlib import import_module
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Optional, Union
+
+# Every benchmark result is {day: {size: {stage: stats}}}, where the stages are
+# usually "parse", "part1" and "part2" with {"min": seconds, "median": seconds},
+# and "peak_memory" with the peak bytes allocated by all the stages together.
+BenchResults = dict[str, dict[str, dict[str, Any]]]
+
+
+def generate_day01(size: int, rng: random.Random) -> str:
+    """
+    :returns: size depths going up and down like a sonar sweep.
+    """
+    depths = []
+    depth = 100
+    for _ in range(size):
+        depth = max(0, depth + rng.randint(-10, 12))
+        depths.append(f"{depth}\n")
+    return "".join(depths)
+
+
+def generate_day02(size: int, rng: random.Random) -> str:
+    """
+    :returns: size commands.
+    """
+    dirs = rng.choices(("forward", "down", "up"), weights=(4, 3, 2), k=size)
+    return "".join(f"{dir} {rng.randint(1, 9)}\n" for dir in dirs)
+
+
+def generate_day03(size: int, rng: random.Random) -> str:
+    """
+    :returns: size distinct bit strings, so that both ratings narrow down to one string.
+
+    The strings are built top-down as a trie where any prefix shared by two or more strings
+    is followed by both a 0 and a 1. Otherwise the CO2 rating could be left with no strings.
+    """
+    width = max(12, size.bit_length() + 2)
+    values = []
+    # (prefix, bits left to generate, number of strings sharing the prefix)
+    stack = [(0, width, size)]
+    while stack:
+        prefix, bits_left, count = stack.pop()
+        if count == 1:
+            values.append(prefix << bits_left | rng.getrandbits(bits_left))
+            continue
+
+        # Split about evenly while each half still fits into the remaining bits
+        capacity = 1 << (bits_left - 1)
+        spread = count // 8
+        ones = min(max(count // 2 + rng.randint(-spread, spread), 1, count - capacity), count - 1, capacity)
+        stack.append((prefix << 1, bits_left - 1, count - ones))
+        stack.append((prefix << 1 | 1, bits_left - 1, ones))
+
+    rng.shuffle(values)
+    return "".join(f"{value:0{width}b}\n" for value in values)
+
+
+def generate_day04(size: int, rng: random.Random) -> str:
+    """
+    :returns: A queue drawing all of 0..99 and size 5x5 boards of distinct numbers.
+    """
+    number_queue = list(range(100))
+    rng.shuffle(number_queue)
+
+    sections = [",".join(map(str, number_queue)) + "\n"]
+    for _ in range(size):
+        numbers = rng.sample(range(100), 25)
+        rows = [" ".join(f"{number:2}" for number in numbers[row_ix * 5 : row_ix * 5 + 5]) for row_ix in range(5)]
+        sections.append("\n".join(rows) + "\n")
+
+    return "\n".join(sections)
+
+
+def generate_day05(size: int, rng: random.Random) -> str:
+    """
+    :returns: size horizontal, vertical and diagonal lines within a 1000x1000 field.
+    """
+    lines = []
+    for _ in range(size):
+        x1, y1 = rng.randint(0, 999), rng.randint(0, 999)
+        delta_x, delta_y = rng.choice(((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)))
+        length = rng.randint(0, 100)
+        x2 = min(max(x1 + delta_x * length, 0), 999)
+        y2 = min(max(y1 + delta_y * length, 0), 999)
+        if delta_x and delta_y:
+            # Keep diagonals at 45 degrees after clamping to the field
+            length = min(abs(x2 - x1), abs(y2 - y1))
+            x2, y2 = x1 + delta_x * length, y1 + delta_y * length
+        lines.append(f"{x1},{y1} -> {x2},{y2}\n")
+    return "".join(lines)
+
+
+GENERATORS: dict[str, Callable[[int, random.Random], str]] = {
+    "01": generate_day01,
+    "02": generate_day02,
+    "03": generate_day03,
+    "04": generate_day04,
+    "05": generate_day05,
+}
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    A separately timed step of solving a day.
+    run takes the result of the source stage, or the input text if there's no source.
+    """
+
+    name: str
+    run: Callable[[Any], Any]
+    source: Optional[str] = None
+    # run changes its argument, so the source is recomputed untimed before every run
+    consumes_source: bool = False
+
+
+def solution_stages(module: ModuleType) -> list[Stage]:
+    return [
+        Stage("parse", module.parse),
+        Stage("part1", module.part1, source="parse"),
+        Stage("part2", module.part2, source="parse"),
+    ]
+
+
+def day04_stages(module: ModuleType) -> list[Stage]:
+    # parse plays the whole game, so the game is split out of it as a stage of its own
+    return [
+        Stage("parse", module.parse_input),
+        Stage("play", lambda parsed: module.play_bingo(*parsed), source="parse", consumes_source=True),
+        Stage("part1", module.part1, source="play"),
+        Stage("part2", module.part2, source="play"),
+    ]
+
+
+STAGES: dict[str, Callable[[ModuleType], list[Stage]]] = {
+    "04": day04_stages,
+}
+
+
+def run_stages(stages: list[Stage], input_txt: str) -> dict[str, Any]:
+    """
+    Runs the stages once in order, so every stage must come after its source.
+
+    :returns: The result of every stage by its name.
+    """
+    results: dict[str, Any] = {}
+    for stage in stages:
+        results[stage.name] = stage.run(input_txt if stage.source is None else results[stage.source])
+    return results
+
+
+def time_stats(fn: Callable[[Any], Any], repeat: int, setup: Callable[[], Any]) -> dict[str, float]:
+    """
+    Times fn called repeat times, each time with a new result of setup, which isn't timed.
+    """
+    times = []
+    for _ in range(repeat):
+        arg = setup()
+        start = time.perf_counter()
+        fn(arg)
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times)}
+
+
+def peak_memory(fn: Callable[[], Any]) -> int:
+    """
+    :returns: The peak number of bytes allocated while running fn.
+    """
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def bench_day(day: str, size: int, seed: int, repeat: int) -> dict[str, Any]:
+    """
+    Times every stage of a day separately on a synthetic input of the given size.
+    """
+    module = import_module(f"day{day}.solution")
+    stages = STAGES.get(day, solution_stages)(module)
+    input_txt = GENERATORS[day](size, random.Random(seed))
+
+    def source_setup(stage_ix: int, stage: Stage) -> Callable[[], Any]:
+        if stage.source is None:
+            return lambda: input_txt
+        source = stage.source
+        if stage.consumes_source:
+            # The stages come in order, so the earlier ones produce the source
+            return lambda: run_stages(stages[:stage_ix], input_txt)[source]
+        return lambda: stage_results[source]
+
+    stage_results = run_stages(stages, input_txt)
+    stats: dict[str, Any] = {}
+    for stage_ix, stage in enumerate(stages):
+        stats[stage.name] = time_stats(stage.run, repeat, source_setup(stage_ix, stage))
+    # Measured apart from the timings, since tracing allocations slows the code down
+    stats["peak_memory"] = peak_memory(lambda: run_stages(stages, input_txt))
+    return stats
+
+
+def run_benchmarks(
+    days: list[str],
+    sizes: list[int],
+    seed: int = 2021,
+    repeat: int = 3,
+    on_result: Optional[Callable[[str, int, dict[str, Any]], None]] = None,
+) -> BenchResults:
+    results: BenchResults = {}
+    for day in days:
+        results[day] = {}
+        for size in sizes:
+            stats = bench_day(day, size, seed, repeat)
+            results[day][str(size)] = stats
+            if on_result:
+                on_result(day, size, stats)
+    return results
+
+
+def find_regressions(results: BenchResults, baseline: BenchResults, tolerance: float) -> list[str]:
+    """
+    Compares the best times and the peak memory with the baseline,
+    skipping the days, sizes and stages that are missing from either.
+
+    :returns: A description of every stage that got worse by more than tolerance, e.g. 0.2 for 20%.
+    """
+    regressions = []
+    for day, results_by_size in results.items():
+        for size, stats in results_by_size.items():
+            baseline_stats = baseline.get(day, {}).get(size)
+            if baseline_stats is None:
+                continue
+
+            for stage, stage_stats in stats.items():
+                baseline_stage_stats = baseline_stats.get(stage)
+                if baseline_stage_stats is None:
+                    continue
+
+                if stage == "peak_memory":
+                    value, baseline_value = stage_stats, baseline_stage_stats
+                else:
+                    value, baseline_value = stage_stats["min"], baseline_stage_stats["min"]
+                if value > baseline_value * (1 + tolerance):
+                    regressions.append(f"day{day} size {size} {stage}: {baseline_value:.6g} -> {value:.6g}")
+
+    return regressions
+
+
+def load_results(path: Union[str, Path]) -> BenchResults:
+    with open(path) as f:
+        results: BenchResults = json.load(f)["results"]
+    return results
+
+
+def save_results(path: Union[str, Path], results: BenchResults, seed: int, repeat: int) -> None:
+    with open(path, "w") as f:
+        json.dump({"seed": seed, "repeat": repeat, "results": results}, f, indent=2)
+        f.write("\n")
@@ -0,0 +1,54 @@
+from pathlib import Path
+
+from bench import BenchResults, bench_day, find_regressions, load_results, save_results
+
+baseline: BenchResults = {
+    "01": {
+        "1000": {
+            "parse": {"min": 0.010, "median": 0.012},
+            "part1": {"min": 0.020, "median": 0.022},
+            "part2": {"min": 0.030, "median": 0.032},
+            "peak_memory": 1000,
+        },
+    },
+}
+
+
+def test_find_regressions() -> None:
+    assert find_regressions(baseline, baseline, 0.2) == []
+
+    results: BenchResults = {
+        "01": {
+            "1000": {
+                "parse": {"min": 0.011, "median": 0.020},
+                "part1": {"min": 0.030, "median": 0.030},
+                "part2": {"min": 0.030, "median": 0.032},
+                "peak_memory": 2000,
+            },
+            "10000": {
+                "parse": {"min": 1.0, "median": 1.0},
+                "part1": {"min": 1.0, "median": 1.0},
+                "part2": {"min": 1.0, "median": 1.0},
+                "peak_memory": 10**9,
+            },
+        },
+    }
+    regressions = find_regressions(results, baseline, 0.2)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("day01 size 1000 part1:")
+    assert regressions[1].startswith("day01 size 1000 peak_memory:")
+
+
+def test_save_results(tmp_path: Path) -> None:
+    results_path = tmp_path / "bench_results.json"
+    save_results(results_path, baseline, seed=2021, repeat=3)
+    assert load_results(results_path) == baseline
+
+
+def test_bench_day() -> None:
+    stats = bench_day("01", 100, seed=2021, repeat=1)
+    assert set(stats) == {"parse", "part1", "part2", "peak_memory"}
+
+    # The game is timed apart from parsing, since the parts only pick the winners
+    stats = bench_day("04", 10, seed=2021, repeat=2)
+    assert set(stats) == {"parse", "play", "part1", "part2", "peak_memory"}
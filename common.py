@@ -1,6 +1,129 @@
+import mmap
+import os
+import re
+from array import array
+from collections import deque
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, TypeVar, Union
 
+T = TypeVar("T")
+R = TypeVar("R")
 
-def read_input_txt(dunder_file: str) -> str:
+Buffer = Union[bytes, bytearray, mmap.mmap]
+
+INT_PATTERN = re.compile(rb"-?\d+")
+
+
+def input_txt_path(dunder_file: str) -> Path:
     base_dir = Path(dunder_file).resolve().parent
-    return (base_dir / "input.txt").read_text()
+    return base_dir / "input.txt"
+
+
+def read_input_txt(dunder_file: str) -> str:
+    return input_txt_path(dunder_file).read_text()
+
+
+def ensure_parsed(input_txt: Union[str, T], parse: Callable[[str], T]) -> T:
+    """
+    Lets part1 and part2 take either the input text or the result of the day's parse,
+    so that the input can be parsed once and shared by both parts.
+    """
+    if isinstance(input_txt, str):
+        return parse(input_txt)
+    return input_txt
+
+
+@contextmanager
+def map_file(path: Union[str, Path]) -> Iterator[Buffer]:
+    """
+    Memory-maps the file read-only, so that it's only paged in as it's read.
+    An empty file, which can't be mapped, gives b"".
+
+    Example::
+        with map_file("day01/input.txt") as buf:
+            depths = parse_ints(buf)
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            yield buf
+
+
+@contextmanager
+def map_input_txt(dunder_file: str) -> Iterator[Buffer]:
+    """
+    Same as read_input_txt, but memory-maps the file with map_file.
+    """
+    with map_file(input_txt_path(dunder_file)) as buf:
+        yield buf
+
+
+def iter_lines(buf: Buffer, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Yields the lines between the start and end offsets, without the line endings.
+
+    E.g.::
+        list(iter_lines(b"1,2\r\n3,4\n"))  # => [b"1,2", b"3,4"]
+    """
+    if end is None:
+        end = len(buf)
+
+    pos = start
+    while pos < end:
+        newline_pos = buf.find(b"\n", pos, end)
+        if newline_pos == -1:
+            newline_pos = end
+        yield bytes(buf[pos:newline_pos]).rstrip(b"\r")
+        pos = newline_pos + 1
+
+
+def parse_ints(buf: Buffer, start: int = 0, end: Optional[int] = None, typecode: str = "q") -> "array[int]":
+    """
+    Parses every integer between the start and end offsets into a typed array,
+    whatever separates them, without decoding the buffer or splitting it into lines.
+
+    E.g.::
+        parse_ints(b"0,9 -> 5,9\n8,0 -> 0,8\n")  # => array('q', [0, 9, 5, 9, 8, 0, 0, 8])
+    """
+    if end is None:
+        end = len(buf)
+
+    return array(typecode, map(int, INT_PATTERN.findall(buf, start, end)))
+
+
+def batched(items: Iterable[T], batch_size: int) -> Iterator[list[T]]:
+    """
+    E.g.::
+        list(batched(range(5), 2))  # => [[0, 1], [2, 3], [4]]
+    """
+    if batch_size < 1:
+        raise ValueError(batch_size)
+
+    iterator = iter(items)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def imap_bounded(executor: Executor, fn: Callable[[T], R], items: Iterable[T], max_pending: int) -> Iterator[R]:
+    """
+    Like executor.map, but pulls the items lazily and keeps at most max_pending
+    of them submitted at a time, so that a long stream doesn't pile up in memory.
+    The results are yielded in the order of the items.
+    """
+    if max_pending < 1:
+        raise ValueError(max_pending)
+
+    pending: deque[Future[R]] = deque()
+    for item in items:
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+        pending.append(executor.submit(fn, item))
+
+    while pending:
+        yield pending.popleft().result()
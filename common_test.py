@@ -0,0 +1,19 @@
+from pathlib import Path
+
+from common import iter_lines, map_file, parse_ints
+
+
+def test_map_file(tmp_path: Path) -> None:
+    input_path = tmp_path / "input.txt"
+    input_path.write_bytes(b"0,9 -> 5,9\r\n-8,0 -> 0,8\n")
+
+    with map_file(input_path) as buf:
+        assert list(iter_lines(buf)) == [b"0,9 -> 5,9", b"-8,0 -> 0,8"]
+        assert list(iter_lines(buf, start=12)) == [b"-8,0 -> 0,8"]
+        assert parse_ints(buf).tolist() == [0, 9, 5, 9, -8, 0, 0, 8]
+        assert parse_ints(buf, 12, 16).tolist() == [-8, 0]
+
+    input_path.write_bytes(b"")
+    with map_file(input_path) as buf:
+        assert list(iter_lines(buf)) == []
+        assert len(parse_ints(buf)) == 0
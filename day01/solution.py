@@ -1,67 +1,296 @@
-from typing import Iterable, Literal, Sequence, TypeVar, overload
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial, reduce
+from itertools import islice
+from operator import lt
+from pathlib import Path
+from typing import Iterable, Iterator, Literal, Optional, Sequence, TypeVar, Union, overload
 
-from common import read_input_txt
+from common import Buffer, ensure_parsed, input_txt_path, map_file, parse_ints
 
 T = TypeVar("T")
 
+# Depths as ints or as lines of text, e.g. an open input file.
+DepthSource = Iterable[Union[int, str]]
+
 
 @overload
-def window(seq: Sequence[T], n: Literal[1]) -> Iterable[tuple[T]]:
+def window(seq: Iterable[T], n: Literal[1]) -> Iterator[tuple[T]]:
     ...
 
 
 @overload
-def window(seq: Sequence[T], n: Literal[2]) -> Iterable[tuple[T, T]]:
+def window(seq: Iterable[T], n: Literal[2]) -> Iterator[tuple[T, T]]:
     ...
 
 
 @overload
-def window(seq: Sequence[T], n: Literal[3]) -> Iterable[tuple[T, T, T]]:
+def window(seq: Iterable[T], n: Literal[3]) -> Iterator[tuple[T, T, T]]:
     ...
 
 
 @overload
-def window(seq: Sequence[T], n: int) -> Iterable[tuple[T, ...]]:
+def window(seq: Iterable[T], n: int) -> Iterator[tuple[T, ...]]:
     ...
 
 
-def window(seq: Sequence[T], n: int) -> Iterable[tuple[T, ...]]:
+def window(seq: Iterable[T], n: int) -> Iterator[tuple[T, ...]]:
+    """
+    Yields every run of n consecutive elements of seq in a single pass.
+
+    E.g.::
+        list(window([1, 2, 3, 4], 3))  # => [(1, 2, 3), (2, 3, 4)]
+    """
     if n < 1:
         raise ValueError(n)
-    elif n == 1:
-        for el in seq:
-            yield (el,)
-    else:
-        for el, rest in zip(seq, window(seq[1:], n - 1)):
-            yield (el, *rest)
 
+    elements = iter(seq)
+    current: deque[T] = deque(islice(elements, n - 1), maxlen=n)
+    for el in elements:
+        current.append(el)
+        yield tuple(current)
+
+
+def window_sums(seq: Iterable[int], n: int) -> Iterator[int]:
+    """
+    Yields the sum of every window of size n.
+    Keeps a running sum instead of building the window tuples.
+
+    E.g.::
+        list(window_sums([1, 2, 3, 4], 3))  # => [6, 9]
+    """
+    if n < 1:
+        raise ValueError(n)
+
+    elements = iter(seq)
+    current: deque[int] = deque(islice(elements, n), maxlen=n)
+    if len(current) < n:
+        return
+
+    window_sum = sum(current)
+    yield window_sum
+    for el in elements:
+        window_sum += el - current[0]
+        current.append(el)
+        yield window_sum
 
-def part1(depths: list[int]) -> int:
+
+def count_increases(values: Iterable[int]) -> int:
+    """
+    :returns: How many values are greater than the value right before them.
+    """
     increases = 0
-    for prev, curr in window(depths, 2):
+    for prev, curr in window(values, 2):
         if curr > prev:
             increases += 1
     return increases
 
 
-def part2(depths: list[int]) -> int:
-    increases = 0
-    prev_window_sum = None
-    for el1, el2, el3 in window(depths, 3):
-        window_sum = el1 + el2 + el3
-        if prev_window_sum is not None and window_sum > prev_window_sum:
-            increases += 1
-        prev_window_sum = window_sum
-    return increases
+def read_depths(source: DepthSource) -> Iterator[int]:
+    """
+    Lazily converts a stream of depths into ints, skipping blank lines.
+
+    E.g.::
+        with open("input.txt") as f:
+            for depth in read_depths(f):
+                ...
+    """
+    for item in source:
+        if isinstance(item, int):
+            yield item
+        elif item.strip():
+            yield int(item)
+
+
+def scan_depths(source: DepthSource, n: int = 3) -> tuple[int, int]:
+    """
+    Computes both answers in a single pass holding only the last n depths.
+
+    The sum of a window grows exactly when the depth entering it
+    is greater than the depth leaving it, so no sums are needed.
+
+    :returns: (part 1 answer, part 2 answer)
+    """
+    if n < 1:
+        raise ValueError(n)
+
+    recent: deque[int] = deque(maxlen=n)
+    depth_increases = 0
+    sum_increases = 0
+    for depth in read_depths(source):
+        if recent and depth > recent[-1]:
+            depth_increases += 1
+        if len(recent) == n and depth > recent[0]:
+            sum_increases += 1
+        recent.append(depth)
+
+    return depth_increases, sum_increases
+
+
+def parse(input_txt: str) -> list[int]:
+    return list(read_depths(input_txt.splitlines()))
+
+
+def part1(depths: Union[str, DepthSource]) -> int:
+    return count_increases(read_depths(ensure_parsed(depths, parse)))
+
+
+def part2(depths: Union[str, DepthSource]) -> int:
+    return count_increases(window_sums(read_depths(ensure_parsed(depths, parse)), 3))
+
+
+def parse_depth_array(input_txt: str) -> "array[int]":
+    """
+    Parses all the depths at once into a typed array.
+    """
+    return array("q", map(int, input_txt.split()))
+
+
+def count_shifted_increases(depths: "array[int]", shift: int) -> int:
+    """
+    Compares the array with itself shifted by the given number of elements.
+    The comparison loop runs in C over zero-copy views of the array.
+
+    E.g.::
+        count_shifted_increases(array("q", [1, 5, 2, 3]), 2)  # => 1 (since 2 > 1, 3 < 5)
+
+    :returns: How many depths[i + shift] are greater than depths[i].
+    """
+    if shift < 1:
+        raise ValueError(shift)
+
+    view = memoryview(depths)
+    return sum(map(lt, view[:-shift], view[shift:]))
+
+
+def part1_vectorized(depths: "array[int]") -> int:
+    return count_shifted_increases(depths, 1)
+
+
+def part2_vectorized(depths: "array[int]") -> int:
+    # Neighbouring 3-sums share two depths, so comparing the sums is the same
+    # as comparing the depths 3 positions apart.
+    return count_shifted_increases(depths, 3)
+
+
+@dataclass(frozen=True)
+class DepthScan:
+    """
+    Counts for a contiguous run of depths, along with the depths at its edges.
+    Scans of neighbouring runs can be merged into the scan of the joined run.
+    """
+
+    head: tuple[int, ...]
+    tail: tuple[int, ...]
+    depth_increases: int = 0
+    sum_increases: int = 0
+
+
+def scan_depth_chunk(depths: Sequence[int], n: int = 3) -> DepthScan:
+    depth_increases, sum_increases = scan_depths(depths, n)
+    return DepthScan(
+        head=tuple(depths[:n]),
+        tail=tuple(depths[-n:]),
+        depth_increases=depth_increases,
+        sum_increases=sum_increases,
+    )
+
+
+def merge_depth_scans(left: DepthScan, right: DepthScan, n: int = 3) -> DepthScan:
+    """
+    Joins the scans of two adjacent runs, counting the comparisons
+    that cross the boundary between them.
+    """
+    joined = left.tail + right.head
+    boundary = len(left.tail)
+
+    def count_crossing(shift: int) -> int:
+        crossing = 0
+        for ix in range(max(0, boundary - shift), boundary):
+            if ix + shift < len(joined) and joined[ix + shift] > joined[ix]:
+                crossing += 1
+        return crossing
+
+    return DepthScan(
+        head=(left.head + right.head)[:n],
+        tail=(left.tail + right.tail)[-n:],
+        depth_increases=left.depth_increases + right.depth_increases + count_crossing(1),
+        sum_increases=left.sum_increases + right.sum_increases + count_crossing(n),
+    )
+
+
+def split_line_chunks(buf: Buffer, chunk_count: int) -> list[tuple[int, int]]:
+    """
+    Splits the buffer into roughly equal byte ranges that end on line boundaries.
+
+    :returns: (start, end) offsets of every non-empty range, in order.
+    """
+    if chunk_count < 1:
+        raise ValueError(chunk_count)
+
+    size = len(buf)
+    chunks = []
+    start = 0
+    for chunk_ix in range(1, chunk_count + 1):
+        if chunk_ix == chunk_count:
+            end = size
+        else:
+            newline_pos = buf.find(b"\n", max(start, size * chunk_ix // chunk_count))
+            end = size if newline_pos == -1 else newline_pos + 1
+
+        if end > start:
+            chunks.append((start, end))
+            start = end
+
+    return chunks
+
+
+def _scan_file_chunk(path: str, n: int, chunk: tuple[int, int]) -> DepthScan:
+    start, end = chunk
+    with map_file(path) as buf:
+        depths = parse_ints(buf, start, end)
+    return scan_depth_chunk(depths, n)
+
+
+def parallel_scan_depths(
+    path: Union[str, Path],
+    n: int = 3,
+    max_workers: Optional[int] = None,
+    chunk_count: Optional[int] = None,
+) -> tuple[int, int]:
+    """
+    Same as scan_depths, but the file is memory-mapped, split into chunks
+    on line boundaries and the chunks are scanned in a process pool.
+
+    :returns: (part 1 answer, part 2 answer)
+    """
+    if n < 1:
+        raise ValueError(n)
+
+    if chunk_count is None:
+        chunk_count = (max_workers or os.cpu_count() or 1) * 4
+    elif chunk_count < 1:
+        raise ValueError(chunk_count)
+
+    path = str(path)
+    with map_file(path) as buf:
+        chunks = split_line_chunks(buf, chunk_count)
+    if not chunks:
+        return 0, 0
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        scans = list(executor.map(partial(_scan_file_chunk, path, n), chunks))
+
+    total = reduce(partial(merge_depth_scans, n=n), scans)
+    return total.depth_increases, total.sum_increases
 
 
 def main() -> None:
-    input_txt = read_input_txt(__file__)
-    input_lines = input_txt.splitlines()
-    depths = [int(line) for line in input_lines]
+    with input_txt_path(__file__).open() as input_file:
+        part1_answer, part2_answer = scan_depths(input_file)
 
-    part1_answer = part1(depths)
     print("Part1:", part1_answer)
-
-    part2_answer = part2(depths)
     print("Part2:", part2_answer)
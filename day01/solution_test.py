@@ -1,4 +1,22 @@
-from .solution import part1, part2
+from pathlib import Path
+
+import pytest
+
+from .solution import (
+    merge_depth_scans,
+    parallel_scan_depths,
+    parse,
+    parse_depth_array,
+    part1,
+    part1_vectorized,
+    part2,
+    part2_vectorized,
+    scan_depth_chunk,
+    scan_depths,
+    split_line_chunks,
+    window,
+    window_sums,
+)
 
 depths = [199, 200, 208, 210, 200, 207, 240, 269, 260, 263]
 
@@ -9,3 +27,58 @@ def test_part1() -> None:
 
 def test_part2() -> None:
     assert part2(depths) == 5
+
+
+def test_window() -> None:
+    assert list(window(depths[:4], 3)) == [(199, 200, 208), (200, 208, 210)]
+    assert list(window(depths[:2], 3)) == []
+
+    long_seq = list(range(5000))
+    windows = list(window(long_seq, 4000))
+    assert len(windows) == 1001
+    assert windows[-1] == tuple(range(1000, 5000))
+
+
+def test_window_sums() -> None:
+    assert list(window_sums(depths, 3)) == [sum(w) for w in window(depths, 3)]
+    assert list(window_sums(depths[:2], 3)) == []
+
+
+def test_streaming() -> None:
+    lines = iter(f"{depth}\n" for depth in depths)
+    assert part1(lines) == 7
+    assert scan_depths(f"{depth}\n" for depth in depths) == (7, 5)
+    assert scan_depths(depths, n=1) == (7, 7)
+
+
+def test_vectorized() -> None:
+    depth_array = parse_depth_array("\n".join(str(depth) for depth in depths) + "\n")
+    assert part1_vectorized(depth_array) == 7
+    assert part2_vectorized(depth_array) == 5
+    assert part2_vectorized(depth_array[:3]) == 0
+
+
+def test_parallel_scan(tmp_path: Path) -> None:
+    depths_path = tmp_path / "depths.txt"
+    depths_path.write_text("\n".join(str(depth) for depth in depths) + "\n")
+
+    assert parallel_scan_depths(depths_path, max_workers=2) == (7, 5)
+    # More chunks than lines, so some chunks hold fewer depths than a window
+    assert parallel_scan_depths(depths_path, max_workers=2, chunk_count=40) == (7, 5)
+
+    chunks = split_line_chunks(depths_path.read_bytes(), 3)
+    scans = [scan_depth_chunk(depths[:4]), scan_depth_chunk(depths[4:5]), scan_depth_chunk(depths[5:])]
+    assert len(chunks) == 3
+    assert merge_depth_scans(merge_depth_scans(scans[0], scans[1]), scans[2]).sum_increases == 5
+
+    with pytest.raises(ValueError):
+        parallel_scan_depths(depths_path, chunk_count=0)
+    with pytest.raises(ValueError):
+        split_line_chunks(depths_path.read_bytes(), -1)
+
+
+def test_parse() -> None:
+    input_txt = "\n".join(str(depth) for depth in depths) + "\n"
+    assert parse(input_txt) == depths
+    assert part1(input_txt) == 7
+    assert part2(input_txt) == 5
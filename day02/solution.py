@@ -1,9 +1,14 @@
 import dataclasses
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Type, TypeVar
+from functools import reduce
+from itertools import accumulate
+from operator import mul
+from typing import Iterable, Iterator, Optional, Type, TypeVar, Union
 
-from common import read_input_txt
+from common import ensure_parsed, read_input_txt
 
 
 class Dir(Enum):
@@ -47,15 +52,6 @@ def apply_command(position: Position, command: Command) -> Position:
         raise ValueError(command.dir)
 
 
-def part1(input_txt: str) -> int:
-    lines = input_txt.splitlines()
-    commands = [parse_command(line) for line in lines]
-    position = Position(x=0, depth=0)
-    for command in commands:
-        position = apply_command(position, command)
-    return position.x * position.depth
-
-
 @dataclass
 class Submarine:
     position: Position = field(default_factory=Position.zero)
@@ -75,21 +71,230 @@ class Submarine:
         else:
             raise ValueError(command.dir)
 
+    def apply_summary(self, summary: "CommandSummary") -> None:
+        self.position = Position(
+            x=self.position.x + summary.x,
+            depth=self.position.depth + summary.depth + self.aim * summary.x,
+        )
+        self.aim += summary.aim
+
+
+DIRS = tuple(Dir)
+OPCODES = {dir.value: opcode for opcode, dir in enumerate(DIRS)}
+
+# How much one unit of a command's amount moves x and aim, indexed by opcode.
+# In part 1 the aim is exactly the depth.
+X_FACTORS = tuple(1 if dir == Dir.FORWARD else 0 for dir in DIRS)
+AIM_FACTORS = tuple(1 if dir == Dir.DOWN else -1 if dir == Dir.UP else 0 for dir in DIRS)
+
+
+@dataclass
+class CommandColumns:
+    """
+    Commands stored column-wise in typed arrays instead of one object per command.
+
+    Example::
+        columns = parse_command_columns("forward 5\ndown 3\n")
+        columns.opcodes  # => array('b', [0, 2])
+        columns.amounts  # => array('q', [5, 3])
+    """
+
+    opcodes: "array[int]" = field(default_factory=lambda: array("b"))
+    amounts: "array[int]" = field(default_factory=lambda: array("q"))
+
+    @classmethod
+    def from_commands(cls, commands: Iterable[Command]) -> "CommandColumns":
+        columns = cls()
+        for command in commands:
+            columns.append(command)
+        return columns
+
+    def append(self, command: Command) -> None:
+        self.opcodes.append(DIRS.index(command.dir))
+        self.amounts.append(command.amount)
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+    def chunks(self, chunk_size: int) -> Iterator["CommandColumns"]:
+        if chunk_size < 1:
+            raise ValueError(chunk_size)
+
+        for start in range(0, len(self), chunk_size):
+            end = start + chunk_size
+            yield CommandColumns(self.opcodes[start:end], self.amounts[start:end])
+
+    def __iter__(self) -> Iterator[Command]:
+        for opcode, amount in zip(self.opcodes, self.amounts):
+            yield Command(DIRS[opcode], amount)
+
+
+def parse_command_columns(input_txt: str) -> CommandColumns:
+    tokens = input_txt.split()
+    dir_strs, amount_strs = tokens[0::2], tokens[1::2]
+    if len(dir_strs) != len(amount_strs):
+        raise ValueError(f"Command without an amount: {dir_strs[-1]}")
+
+    try:
+        opcodes = array("b", map(OPCODES.__getitem__, dir_strs))
+    except KeyError as e:
+        raise ValueError(e.args[0]) from e
+
+    amounts = array("q", map(int, amount_strs))
+    return CommandColumns(opcodes, amounts)
+
+
+def fold_commands(columns: CommandColumns) -> tuple[Position, Submarine]:
+    """
+    Applies all the commands at once, starting from zero.
+    Part 2 depth is the dot product of the forward moves and the cumulative aim.
+
+    :returns: (the position by part 1 rules, the submarine by part 2 rules)
+    """
+    x_deltas = array("q", map(mul, map(X_FACTORS.__getitem__, columns.opcodes), columns.amounts))
+    aim_deltas = map(mul, map(AIM_FACTORS.__getitem__, columns.opcodes), columns.amounts)
+    aims = array("q", accumulate(aim_deltas))
+
+    x = sum(x_deltas)
+    aim = aims[-1] if aims else 0
+    depth = sum(map(mul, aims, x_deltas))
+
+    return Position(x=x, depth=aim), Submarine(position=Position(x=x, depth=depth), aim=aim)
+
+
+@dataclass(frozen=True)
+class CommandSummary:
+    """
+    The effect of a run of commands by part 2 rules, as if it started from zero.
+    Applied to a submarine with some aim, the run also sinks it by aim * x.
+
+    Summaries of consecutive runs combine in order::
+        summarize_commands(a).then(summarize_commands(b))  # == summary of a followed by b
+    """
+
+    x: int = 0
+    depth: int = 0
+    aim: int = 0
+
+    def then(self, other: "CommandSummary") -> "CommandSummary":
+        return CommandSummary(
+            x=self.x + other.x,
+            depth=self.depth + other.depth + self.aim * other.x,
+            aim=self.aim + other.aim,
+        )
+
+
+def summarize_commands(columns: CommandColumns) -> CommandSummary:
+    _, submarine = fold_commands(columns)
+    return CommandSummary(x=submarine.position.x, depth=submarine.position.depth, aim=submarine.aim)
+
+
+def reduce_commands(
+    columns: CommandColumns,
+    chunk_size: int = 100_000,
+    max_workers: Optional[int] = None,
+) -> Submarine:
+    """
+    Summarizes chunks of commands in a process pool and combines the summaries in order.
+
+    :returns: The same submarine as applying every command to Submarine() one by one.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        summaries = executor.map(summarize_commands, columns.chunks(chunk_size))
+        summary = reduce(CommandSummary.then, summaries, CommandSummary())
 
-def part2(input_txt: str) -> int:
-    lines = input_txt.splitlines()
-    commands = [parse_command(line) for line in lines]
     submarine = Submarine()
-    for command in commands:
-        submarine.apply_command(command)
+    submarine.apply_summary(summary)
+    return submarine
+
+
+class PositionIndex:
+    """
+    Prefix states of a command list for constant time point-in-time queries.
+
+    Example::
+        index = PositionIndex(parse_command_columns("forward 5\ndown 5\nforward 8\n"))
+        index.position(2)  # => Position(x=5, depth=5), after the first 2 commands
+        index.submarine(3)  # => Submarine(position=Position(x=13, depth=40), aim=5)
+        index.append(Command(Dir.UP, 3))
+        index.submarine(4).aim  # => 2
+    """
+
+    def __init__(self, commands: Iterable[Command] = ()) -> None:
+        # Element i is the state after the first i commands
+        self.xs = [0]
+        self.aims = [0]
+        self.depths = [0]
+        self.extend(commands)
+
+    def __len__(self) -> int:
+        """
+        :returns: The number of indexed commands.
+        """
+        return len(self.xs) - 1
+
+    def append(self, command: Command) -> None:
+        x, aim, depth = self.xs[-1], self.aims[-1], self.depths[-1]
+        if command.dir == Dir.FORWARD:
+            x += command.amount
+            depth += aim * command.amount
+        elif command.dir == Dir.UP:
+            aim -= command.amount
+        elif command.dir == Dir.DOWN:
+            aim += command.amount
+        else:
+            raise ValueError(command.dir)
+
+        self.xs.append(x)
+        self.aims.append(aim)
+        self.depths.append(depth)
+
+    def extend(self, commands: Iterable[Command]) -> None:
+        for command in commands:
+            self.append(command)
+
+    def position(self, command_count: int) -> Position:
+        """
+        :returns: The position by part 1 rules after the first command_count commands.
+        """
+        self._check_count(command_count)
+        return Position(x=self.xs[command_count], depth=self.aims[command_count])
+
+    def submarine(self, command_count: int) -> Submarine:
+        """
+        :returns: The submarine by part 2 rules after the first command_count commands.
+        """
+        self._check_count(command_count)
+        return Submarine(
+            position=Position(x=self.xs[command_count], depth=self.depths[command_count]),
+            aim=self.aims[command_count],
+        )
+
+    def _check_count(self, command_count: int) -> None:
+        if not 0 <= command_count <= len(self):
+            raise IndexError(command_count)
+
+
+def parse(input_txt: str) -> CommandColumns:
+    return parse_command_columns(input_txt)
+
+
+def part1(input_txt: Union[str, CommandColumns]) -> int:
+    position, _ = fold_commands(ensure_parsed(input_txt, parse))
+    return position.x * position.depth
+
+
+def part2(input_txt: Union[str, CommandColumns]) -> int:
+    _, submarine = fold_commands(ensure_parsed(input_txt, parse))
     return submarine.position.x * submarine.position.depth
 
 
 def main() -> None:
     input_txt = read_input_txt(__file__)
+    commands = parse(input_txt)
 
-    part1_answer = part1(input_txt)
+    part1_answer = part1(commands)
     print("Part1:", part1_answer)
 
-    part2_answer = part2(input_txt)
+    part2_answer = part2(commands)
     print("Part2:", part2_answer)
@@ -1,4 +1,20 @@
-from .solution import part1, part2
+import pytest
+
+from .solution import (
+    CommandColumns,
+    Position,
+    PositionIndex,
+    Submarine,
+    apply_command,
+    fold_commands,
+    parse,
+    parse_command,
+    parse_command_columns,
+    part1,
+    part2,
+    reduce_commands,
+    summarize_commands,
+)
 
 
 def test_part1() -> None:
@@ -9,3 +25,62 @@ def test_part1() -> None:
 def test_part2() -> None:
     input_txt = "forward 5\ndown 5\nforward 8\nup 3\ndown 8\nforward 2\n"
     assert part2(input_txt) == 900
+
+
+def test_fold_commands() -> None:
+    input_txt = "forward 5\ndown 5\nforward 8\nup 3\ndown 8\nforward 2\n"
+    columns = parse_command_columns(input_txt)
+    assert list(columns) == [parse_command(line) for line in input_txt.splitlines()]
+
+    position, submarine = fold_commands(columns)
+    assert position == Position(x=15, depth=10)
+    assert submarine == Submarine(position=Position(x=15, depth=60), aim=10)
+
+    assert fold_commands(CommandColumns()) == (Position.zero(), Submarine())
+
+
+def test_reduce_commands() -> None:
+    input_txt = "forward 5\ndown 5\nforward 8\nup 3\ndown 8\nforward 2\nup 20\nforward 3\n"
+    columns = parse_command_columns(input_txt)
+
+    expected = Submarine()
+    for command in columns:
+        expected.apply_command(command)
+
+    assert reduce_commands(columns, chunk_size=3, max_workers=2) == expected
+    assert reduce_commands(CommandColumns(), max_workers=1) == Submarine()
+    with pytest.raises(ValueError):
+        reduce_commands(columns, chunk_size=0, max_workers=1)
+    with pytest.raises(ValueError):
+        reduce_commands(columns, chunk_size=-1, max_workers=1)
+
+    submarine = Submarine(aim=4)
+    submarine.apply_summary(summarize_commands(columns))
+    assert submarine.position.depth == expected.position.depth + 4 * expected.position.x
+
+
+def test_position_index() -> None:
+    input_txt = "forward 5\ndown 5\nforward 8\nup 3\ndown 8\nforward 2\n"
+    commands = list(parse_command_columns(input_txt))
+
+    index = PositionIndex(commands[:4])
+    index.extend(commands[4:])
+    assert len(index) == 6
+
+    position = Position.zero()
+    submarine = Submarine()
+    for command_count, command in enumerate(commands, start=1):
+        position = apply_command(position, command)
+        submarine.apply_command(command)
+        assert index.position(command_count) == position
+        assert index.submarine(command_count) == submarine
+
+    assert index.submarine(0) == Submarine()
+    with pytest.raises(IndexError):
+        index.position(7)
+
+
+def test_parse() -> None:
+    commands = parse("forward 5\ndown 5\nforward 8\nup 3\ndown 8\nforward 2\n")
+    assert part1(commands) == 150
+    assert part2(commands) == 900
@@ -1,53 +1,112 @@
-from typing import Iterator, Optional, Protocol
+import os
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import reduce
+from typing import Iterable, Iterator, Optional, Protocol, Union, cast
 
-from common import read_input_txt
+from common import batched, ensure_parsed, imap_bounded, read_input_txt
 
 
 class BitString:
+    """
+    A string of bits stored as an int, the first bit being the most significant one.
+    """
+
+    __slots__ = ("value", "length")
+
     def __init__(self, bits: Optional[str] = None, length: Optional[int] = None) -> None:
         """
         :param bits: E.g. "001101"
         :param length: Given length 5 produces "00000"
         """
         if bits:
-            self.bits = bits
+            self.value = int(bits, 2)
+            self.length = len(bits)
         elif length:
-            self.bits = "0" * length
+            self.value = 0
+            self.length = length
         else:
-            self.bits = ""
+            self.value = 0
+            self.length = 0
+
+    @classmethod
+    def from_int(cls, value: int, length: int) -> "BitString":
+        """
+        E.g.::
+            BitString.from_int(9, 5)  # => BitString("01001")
+        """
+        bit_string = cls()
+        bit_string.value = value
+        bit_string.length = length
+        return bit_string
+
+    @classmethod
+    def parse_report(cls, report_txt: str) -> list["BitString"]:
+        """
+        E.g.::
+            BitString.parse_report("01001\n10\n")  # => [BitString("01001"), BitString("10")]
+        """
+        return [cls.from_int(int(line, 2), len(line)) for line in report_txt.split()]
+
+    @property
+    def bits(self) -> str:
+        """
+        E.g.::
+            BitString.from_int(9, 5).bits  # => "01001"
+        """
+        if not self.length:
+            return ""
+        return format(self.value, f"0{self.length}b")
+
+    def _shift(self, index: int) -> Optional[int]:
+        """
+        :returns: The position of the bit at index counting from the least significant one,
+            or None if the index is out of range.
+        """
+        if index < 0:
+            index += self.length
+        if 0 <= index < self.length:
+            return self.length - 1 - index
+        return None
 
     def __getitem__(self, index: int) -> bool:
         """
         E.g.::
             BitString("01001")[1]  # => True
             BitString("01001")[2]  # => False
+            BitString("01001")[9]  # => False
         """
-        try:
-            return self.bits[index] == "1"
-        except IndexError:
+        shift = self._shift(index)
+        if shift is None:
             return False
+        return bool(self.value >> shift & 1)
 
     def __setitem__(self, index: int, bit: bool) -> None:
         """
         E.g.::
             BitString("01001")[1] = False  # => BitString("00001")
+            BitString("01001")[6] = True  # => BitString("0100101")
         """
-        pre_bits = self.bits[:index]
-        if len(pre_bits) < index:
-            pre_bits += "0" * (index - len(pre_bits))
-
-        post_bits = self.bits[index + 1 :]
+        if index >= self.length:
+            self.value <<= index + 1 - self.length
+            self.length = index + 1
 
-        new_bit = "1" if bit else "0"
+        shift = self._shift(index)
+        if shift is None:
+            raise IndexError(index)
 
-        self.bits = pre_bits + new_bit + post_bits
+        if bit:
+            self.value |= 1 << shift
+        else:
+            self.value &= ~(1 << shift)
 
     def __len__(self) -> int:
         """
         E.g.::
             len(BitString("01001"))  # => 5
         """
-        return len(self.bits)
+        return self.length
 
     def __iter__(self) -> Iterator[bool]:
         """
@@ -61,22 +120,18 @@ class BitString:
             # False
             # True
         """
-        for bit_str in self.bits:
-            yield bit_str == "1"
+        for shift in range(self.length - 1, -1, -1):
+            yield bool(self.value >> shift & 1)
 
     def __int__(self) -> int:
         """
         E.g.::
             int(BitString("01001"))  # => 9
         """
-        integer = 0
-        for bit in self:
-            if bit:
-                integer = integer * 2 + 1
-            else:
-                integer = integer * 2
+        return self.value
 
-        return integer
+    def __repr__(self) -> str:
+        return f"BitString({self.bits!r})"
 
 
 def get_bit_stats(bit_strings: list[BitString], bit_ix: int) -> tuple[int, int]:
@@ -94,33 +149,149 @@ def get_bit_stats(bit_strings: list[BitString], bit_ix: int) -> tuple[int, int]:
     return count_ones, count_zeros
 
 
-def extract_rates(bit_strings: list[BitString]) -> tuple[int, int]:
+def popcount(integer: int) -> int:
     """
-    :returns: (gamma rate, epsilon rate)
+    E.g.::
+        popcount(0b1011)  # => 3
     """
-    max_string_len = max(len(s) for s in bit_strings)
+    return bin(integer).count("1")
 
-    # Count 1's and 0's for each bit position
-    bit_stats = []
-    for bit_ix in range(max_string_len):
-        bit_stats.append(get_bit_stats(bit_strings, bit_ix))
 
-    # Calculate gamma and epsilon using the collected counts
-    gamma = BitString(length=max_string_len)
-    epsilon = BitString(length=max_string_len)
-    for bit_ix, (count_ones, count_zeros) in enumerate(bit_stats):
-        if count_ones > count_zeros:
-            gamma[bit_ix] = True
-            epsilon[bit_ix] = False
+class BitColumns:
+    """
+    Bit-sliced bit strings: every bit position is stored as one int
+    with a bit set for every row having 1 at this position.
+
+    Example::
+        columns = BitColumns.from_bit_strings([BitString("01"), BitString("11"), BitString("10")])
+        columns.masks  # => [0b110, 0b011]
+        columns.bit_stats(0)  # => (2, 1)
+    """
+
+    def __init__(self, masks: list[int], row_count: int) -> None:
+        self.masks = masks
+        self.row_count = row_count
+
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> "BitColumns":
+        """
+        Shorter lines are padded with zeroes on the right, same as missing bits in BitString.
+        """
+        width = max((len(line) for line in lines), default=0)
+        padded_lines = [line.ljust(width, "0") for line in lines]
+        # Reversed so that row 0 maps to the least significant bit
+        masks = [int("".join(column)[::-1], 2) for column in zip(*padded_lines)]
+        return cls(masks, len(lines))
+
+    @classmethod
+    def from_bit_strings(cls, bit_strings: list[BitString]) -> "BitColumns":
+        return cls.from_lines([bit_string.bits for bit_string in bit_strings])
+
+    @property
+    def width(self) -> int:
+        return len(self.masks)
+
+    def bit_stats(self, bit_ix: int) -> tuple[int, int]:
+        """
+        :returns: (number of ones, number of zeroes) at index bit_ix, same as get_bit_stats.
+        """
+        if bit_ix < 0:
+            bit_ix += self.width
+        if 0 <= bit_ix < self.width:
+            count_ones = popcount(self.masks[bit_ix])
         else:
-            gamma[bit_ix] = False
-            epsilon[bit_ix] = True
+            count_ones = 0
+        return count_ones, self.row_count - count_ones
+
+    def rates(self) -> tuple[int, int]:
+        """
+        :returns: (gamma rate, epsilon rate)
+        """
+        return BitCounter.from_columns(self).rates()
+
+
+@dataclass
+class BitCounter:
+    """
+    Counts of ones at every bit position over some number of rows.
+    Counters of separate chunks of a report merge into the counter of the whole report.
+    """
+
+    row_count: int = 0
+    ones: list[int] = field(default_factory=list)
+
+    @classmethod
+    def from_columns(cls, columns: BitColumns) -> "BitCounter":
+        return cls(row_count=columns.row_count, ones=[popcount(mask) for mask in columns.masks])
 
-    return int(gamma), int(epsilon)
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> "BitCounter":
+        return cls.from_columns(BitColumns.from_lines(lines))
+
+    def merge(self, other: "BitCounter") -> "BitCounter":
+        # Shorter rows have zeroes at the missing positions
+        width = max(len(self.ones), len(other.ones))
+        ones = [0] * width
+        for counter in (self, other):
+            for bit_ix, count_ones in enumerate(counter.ones):
+                ones[bit_ix] += count_ones
+
+        return BitCounter(row_count=self.row_count + other.row_count, ones=ones)
+
+    def rates(self) -> tuple[int, int]:
+        """
+        :returns: (gamma rate, epsilon rate)
+        """
+        gamma = 0
+        for count_ones in self.ones:
+            gamma <<= 1
+            if count_ones * 2 > self.row_count:
+                gamma |= 1
+
+        # Epsilon takes the other bit at every position, ties included
+        epsilon = gamma ^ ((1 << len(self.ones)) - 1)
+        return gamma, epsilon
+
+
+def stream_rates(
+    report_lines: Iterable[str],
+    chunk_size: int = 100_000,
+    max_workers: Optional[int] = None,
+) -> tuple[int, int]:
+    """
+    Counts the bits of report chunks in a process pool and merges the counters,
+    reading only a few chunks ahead of the pool.
+
+    Example::
+        with open("input.txt") as f:
+            gamma, epsilon = stream_rates(f)
+
+    :returns: (gamma rate, epsilon rate)
+    """
+    stripped_lines = (line.strip() for line in report_lines)
+    chunks = batched((line for line in stripped_lines if line), chunk_size)
+    max_pending = 2 * (max_workers or os.cpu_count() or 1)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        counters = imap_bounded(executor, BitCounter.from_lines, chunks, max_pending)
+        counter = reduce(BitCounter.merge, counters, BitCounter())
+
+    return counter.rates()
 
 
-def part1(input_txt: str) -> int:
-    bit_strings = [BitString(line) for line in input_txt.splitlines()]
+def extract_rates(bit_strings: list[BitString]) -> tuple[int, int]:
+    """
+    :returns: (gamma rate, epsilon rate)
+    """
+    return BitColumns.from_bit_strings(bit_strings).rates()
+
+
+def parse(input_txt: str) -> list[BitString]:
+    return BitString.parse_report(input_txt)
+
+
+def part1(input_txt: Union[str, list[BitString]]) -> int:
+    bit_strings = ensure_parsed(input_txt, parse)
     gamma, epsilon = extract_rates(bit_strings)
     return gamma * epsilon
 
@@ -146,6 +317,21 @@ class RatingCriteria(Protocol):
         ...
 
 
+class BitRatingCriteria(RatingCriteria, Protocol):
+    """
+    Criteria that keep the bit strings having keep_bit at bit_ix
+    and can be prepared from the bit counts alone.
+    RatingIndex uses such criteria without filtering any lists,
+    unless a subclass overrides prepare or match.
+    """
+
+    keep_bit: bool
+
+    @classmethod
+    def from_bit_stats(cls, bit_ix: int, count_ones: int, count_zeros: int) -> "BitRatingCriteria":
+        ...
+
+
 class O2GenRatingCriteria:
     """
     O2 generator rating criteria.
@@ -157,7 +343,10 @@ class O2GenRatingCriteria:
 
     @classmethod
     def prepare(cls, bit_strings: list[BitString], bit_ix: int) -> "O2GenRatingCriteria":
-        count_ones, count_zeros = get_bit_stats(bit_strings, bit_ix)
+        return cls.from_bit_stats(bit_ix, *get_bit_stats(bit_strings, bit_ix))
+
+    @classmethod
+    def from_bit_stats(cls, bit_ix: int, count_ones: int, count_zeros: int) -> "O2GenRatingCriteria":
         if count_ones > count_zeros:
             return cls(bit_ix=bit_ix, keep_bit=True)
         elif count_ones < count_zeros:
@@ -180,7 +369,10 @@ class CO2ScrubRatingCriteria:
 
     @classmethod
     def prepare(cls, bit_strings: list[BitString], bit_ix: int) -> "CO2ScrubRatingCriteria":
-        count_ones, count_zeros = get_bit_stats(bit_strings, bit_ix)
+        return cls.from_bit_stats(bit_ix, *get_bit_stats(bit_strings, bit_ix))
+
+    @classmethod
+    def from_bit_stats(cls, bit_ix: int, count_ones: int, count_zeros: int) -> "CO2ScrubRatingCriteria":
         if count_ones > count_zeros:
             return cls(bit_ix=bit_ix, keep_bit=False)
         elif count_ones < count_zeros:
@@ -210,18 +402,81 @@ def extract_rating(bit_strings: list[BitString], criteria_cls: type[RatingCriter
         raise ValueError(f"Didn't work: {bit_strings}")
 
 
-def part2(input_txt: str) -> int:
-    bit_strings = [BitString(line) for line in input_txt.splitlines()]
-    o2_rating = extract_rating(bit_strings, O2GenRatingCriteria)
-    co2_rating = extract_rating(bit_strings, CO2ScrubRatingCriteria)
+# Criteria classes decided by their from_bit_stats alone
+BIT_STATS_CRITERIA: tuple[type, ...] = (O2GenRatingCriteria, CO2ScrubRatingCriteria)
+
+
+def _is_bit_stats_criteria(criteria_cls: type[RatingCriteria]) -> bool:
+    """
+    :returns: True for the classes in BIT_STATS_CRITERIA and their subclasses
+        that don't override prepare or match.
+    """
+    for base in BIT_STATS_CRITERIA:
+        if issubclass(criteria_cls, base):
+            subclasses = criteria_cls.__mro__[: criteria_cls.__mro__.index(base)]
+            return not any("prepare" in vars(cls) or "match" in vars(cls) for cls in subclasses)
+    return False
+
+
+class RatingIndex:
+    """
+    Bit strings sorted once for extracting any number of ratings.
+
+    Strings sharing the first bit_ix bits form a contiguous range of the sorted strings,
+    ordered by the bit at bit_ix. So each step of extract_rating narrows a range
+    with a binary search for the first string having 1 at bit_ix.
+    """
+
+    def __init__(self, bit_strings: list[BitString]) -> None:
+        self.bit_strings = bit_strings
+        self.width = max(len(s) for s in bit_strings)
+
+        # Shorter strings are aligned to the left, since their missing bits are zeroes
+        keyed_ixs = sorted((int(s) << (self.width - len(s)), ix) for ix, s in enumerate(bit_strings))
+        self.keys = [key for key, _ in keyed_ixs]
+        self.sorted_bit_strings = [bit_strings[ix] for _, ix in keyed_ixs]
+
+    def extract(self, criteria_cls: type[RatingCriteria]) -> int:
+        """
+        :returns: Same as extract_rating(self.bit_strings, criteria_cls).
+        """
+        if not _is_bit_stats_criteria(criteria_cls):
+            return extract_rating(self.bit_strings, criteria_cls)
+        from_bit_stats = cast(type[BitRatingCriteria], criteria_cls).from_bit_stats
+
+        start, end = 0, len(self.keys)
+        bit_ix = 0
+        while bit_ix < self.width and end - start > 1:
+            shift = self.width - 1 - bit_ix
+            prefix = self.keys[start] >> (shift + 1) << (shift + 1)
+            split = bisect_left(self.keys, prefix | (1 << shift), start, end)
+
+            criteria: BitRatingCriteria = from_bit_stats(bit_ix, end - split, split - start)
+            if criteria.keep_bit:
+                start = split
+            else:
+                end = split
+            bit_ix += 1
+
+        if end - start == 1:
+            return int(self.sorted_bit_strings[start])
+        else:
+            raise ValueError(f"Didn't work: {self.sorted_bit_strings[start:end]}")
+
+
+def part2(input_txt: Union[str, list[BitString]]) -> int:
+    rating_index = RatingIndex(ensure_parsed(input_txt, parse))
+    o2_rating = rating_index.extract(O2GenRatingCriteria)
+    co2_rating = rating_index.extract(CO2ScrubRatingCriteria)
     return o2_rating * co2_rating
 
 
 def main() -> None:
     input_txt = read_input_txt(__file__)
+    bit_strings = parse(input_txt)
 
-    part1_answer = part1(input_txt)
+    part1_answer = part1(bit_strings)
     print("Part1:", part1_answer)
 
-    part2_answer = part2(input_txt)
+    part2_answer = part2(bit_strings)
     print("Part2:", part2_answer)
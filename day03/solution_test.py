@@ -1,4 +1,19 @@
-from .solution import part1, part2
+import pytest
+
+from .solution import (
+    BitColumns,
+    BitCounter,
+    BitString,
+    CO2ScrubRatingCriteria,
+    O2GenRatingCriteria,
+    RatingIndex,
+    extract_rating,
+    get_bit_stats,
+    parse,
+    part1,
+    part2,
+    stream_rates,
+)
 
 input_txt = (
     "00100\n"
@@ -22,3 +37,105 @@ def test_part1() -> None:
 
 def test_part2() -> None:
     assert part2(input_txt) == 230
+
+
+def test_bit_string() -> None:
+    bit_string = BitString("01001")
+    assert [bit_string[ix] for ix in range(-6, 7)] == [
+        False,
+        False,
+        True,
+        False,
+        False,
+        True,
+        False,
+        True,
+        False,
+        False,
+        True,
+        False,
+        False,
+    ]
+    assert int(bit_string) == 9
+    assert list(bit_string) == [False, True, False, False, True]
+
+    bit_string[1] = False
+    assert bit_string.bits == "00001"
+    bit_string[6] = True
+    assert bit_string.bits == "0000101"
+    assert len(bit_string) == 7
+
+    assert BitString(length=3).bits == "000"
+    assert BitString().bits == ""
+    assert [s.bits for s in BitString.parse_report("01001\n10\n")] == ["01001", "10"]
+
+
+def test_bit_columns() -> None:
+    bit_strings = BitString.parse_report(input_txt)
+    columns = BitColumns.from_bit_strings(bit_strings)
+    for bit_ix in range(-1, 6):
+        assert columns.bit_stats(bit_ix) == get_bit_stats(bit_strings, bit_ix)
+    assert columns.rates() == (22, 9)
+
+    ragged_columns = BitColumns.from_lines(["1", "110", "01"])
+    assert ragged_columns.masks == [0b011, 0b110, 0b000]
+    assert ragged_columns.rates() == (0b110, 0b001)
+
+
+class MaxValueCriteria:
+    """
+    Keeps the greatest bit string, only through the RatingCriteria interface.
+    """
+
+    def __init__(self, max_value: int) -> None:
+        self.max_value = max_value
+
+    @classmethod
+    def prepare(cls, bit_strings: list[BitString], bit_ix: int) -> "MaxValueCriteria":
+        return cls(max(int(s) for s in bit_strings))
+
+    def match(self, bit_string: BitString) -> bool:
+        return int(bit_string) == self.max_value
+
+
+class EvenO2GenRatingCriteria(O2GenRatingCriteria):
+    """
+    O2 generator rating criteria that also discard the odd values.
+    """
+
+    def match(self, bit_string: BitString) -> bool:
+        return super().match(bit_string) and int(bit_string) % 2 == 0
+
+
+def test_rating_index() -> None:
+    bit_strings = BitString.parse_report(input_txt)
+    rating_index = RatingIndex(bit_strings)
+    assert rating_index.extract(O2GenRatingCriteria) == 23
+    assert rating_index.extract(CO2ScrubRatingCriteria) == 10
+    assert rating_index.extract(MaxValueCriteria) == extract_rating(bit_strings, MaxValueCriteria) == 0b11110
+
+    ragged_bit_strings = BitString.parse_report("1\n011\n110\n0\n")
+    ragged_index = RatingIndex(ragged_bit_strings)
+    for criteria_cls in (O2GenRatingCriteria, CO2ScrubRatingCriteria):
+        assert ragged_index.extract(criteria_cls) == extract_rating(ragged_bit_strings, criteria_cls)
+
+    with pytest.raises(ValueError):
+        RatingIndex(BitString.parse_report("10\n10\n")).extract(O2GenRatingCriteria)
+
+    # Overriding match must not be bypassed by the bit counting
+    assert rating_index.extract(EvenO2GenRatingCriteria) == extract_rating(bit_strings, EvenO2GenRatingCriteria) == 30
+
+
+def test_stream_rates() -> None:
+    lines = input_txt.splitlines(keepends=True)
+    assert stream_rates(lines, chunk_size=5, max_workers=2) == (22, 9)
+
+    counter = BitCounter.from_lines(["1", "110"]).merge(BitCounter.from_lines(["01"]))
+    assert counter == BitCounter(row_count=3, ones=[2, 2, 0])
+    assert counter.rates() == (0b110, 0b001)
+
+
+def test_parse() -> None:
+    bit_strings = parse(input_txt)
+    assert part1(bit_strings) == 198
+    assert part2(bit_strings) == 230
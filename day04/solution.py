@@ -1,7 +1,14 @@
-from dataclasses import InitVar, dataclass, field
-from typing import Iterator, Optional
+import os
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import InitVar, dataclass, field, replace
+from functools import lru_cache, partial
+from itertools import chain, compress, repeat
+from operator import attrgetter, eq, gt
+from typing import Generic, Iterable, Iterator, Optional, Protocol, TypeVar, Union
 
-from common import read_input_txt
+from common import batched, ensure_parsed, imap_bounded, read_input_txt
 
 
 @dataclass
@@ -32,6 +39,16 @@ class Board:
     rows: list[list[BoardCell]] = field(init=False)
     winning_draw: Optional[int] = None
 
+    # Positions of every number on the board, hits of every line and the sum of unmarked numbers,
+    # kept up to date so that marking costs only as much as the number occurs on the board.
+    # The positions are flat cell indices (row_ix * size + column_ix): a single index for a number
+    # occurring once, or the indices as dict keys for a repeated number, so that moving a cell is O(1).
+    _cells_by_number: dict[int, Union[int, dict[int, None]]] = field(init=False, repr=False, compare=False)
+    _row_hits: list[int] = field(init=False, repr=False, compare=False)
+    _column_hits: list[int] = field(init=False, repr=False, compare=False)
+    _unmarked_sum: int = field(init=False, repr=False, compare=False)
+    _is_winning: bool = field(init=False, repr=False, compare=False)
+
     def __post_init__(self, size: int) -> None:
         self.rows = []
         for _ in range(size):
@@ -40,17 +57,91 @@ class Board:
                 row.append(BoardCell(0))
             self.rows.append(row)
 
+        self._cells_by_number = {0: dict.fromkeys(range(size * size))} if size else {}
+        self._row_hits = [0] * size
+        self._column_hits = [0] * size
+        self._unmarked_sum = 0
+        self._is_winning = False
+
+    @classmethod
+    def from_grid(cls, grid: list[list[int]]) -> "Board":
+        """
+        Same as setting every number of a square grid one by one, but builds the cells
+        and indexes their numbers in a single pass.
+        """
+        size = len(grid)
+        if any(len(row) != size for row in grid):
+            raise ValueError(f"The grid isn't square: {grid}")
+
+        board = cls(size=0)
+        board.rows = [[BoardCell(number) for number in row] for row in grid]
+        board._cells_by_number = {}
+        for cell_ix, number in enumerate(chain.from_iterable(grid)):
+            board._add_cell_ix(number, cell_ix)
+        board._row_hits = [0] * size
+        board._column_hits = [0] * size
+        board._unmarked_sum = sum(map(sum, grid))
+        return board
+
     def __setitem__(self, cell_indices: tuple[int, int], number: int) -> None:
         row_ix, column_ix = cell_indices
-        self.rows[row_ix][column_ix].number = number
+        cell = self.rows[row_ix][column_ix]
+
+        cell_ix = row_ix * len(self.rows) + column_ix
+        self._remove_cell_ix(cell.number, cell_ix)
+        self._add_cell_ix(number, cell_ix)
+
+        if not cell.marked:
+            self._unmarked_sum += number - cell.number
+
+        cell.number = number
+
+    def _add_cell_ix(self, number: int, cell_ix: int) -> None:
+        cell_ixs = self._cells_by_number.get(number)
+        if cell_ixs is None:
+            self._cells_by_number[number] = cell_ix
+        elif isinstance(cell_ixs, int):
+            self._cells_by_number[number] = {cell_ixs: None, cell_ix: None}
+        else:
+            cell_ixs[cell_ix] = None
+
+    def _remove_cell_ix(self, number: int, cell_ix: int) -> None:
+        cell_ixs = self._cells_by_number[number]
+        if isinstance(cell_ixs, int):
+            del self._cells_by_number[number]
+            return
+
+        del cell_ixs[cell_ix]
+        if not cell_ixs:
+            del self._cells_by_number[number]
+
+    def _cell_ixs(self, number: int) -> Iterable[int]:
+        cell_ixs = self._cells_by_number.get(number, ())
+        return (cell_ixs,) if isinstance(cell_ixs, int) else cell_ixs
+
+    @property
+    def numbers(self) -> Iterable[int]:
+        """
+        :returns: Every number on the board, once.
+        """
+        return self._cells_by_number.keys()
 
     def mark(self, number: int) -> None:
         was_winning = self.is_winning
 
-        for row in self.rows:
-            for cell in row:
-                if cell.number == number:
-                    cell.marked = True
+        size = len(self.rows)
+        for cell_ix in self._cell_ixs(number):
+            row_ix, column_ix = divmod(cell_ix, size)
+            cell = self.rows[row_ix][column_ix]
+            if cell.marked:
+                continue
+
+            cell.marked = True
+            self._unmarked_sum -= number
+            self._row_hits[row_ix] += 1
+            self._column_hits[column_ix] += 1
+            if self._row_hits[row_ix] == size or self._column_hits[column_ix] == size:
+                self._is_winning = True
 
         if not was_winning and self.is_winning:
             self.winning_draw = number
@@ -62,28 +153,114 @@ class Board:
 
     @property
     def is_winning(self) -> bool:
-        for row in self.rows:
-            if all(cell.marked for cell in row):
-                return True
-
-        for column in self.columns:
-            if all(cell.marked for cell in column):
-                return True
+        return self._is_winning
 
-        return False
+    @property
+    def unmarked_sum(self) -> int:
+        return self._unmarked_sum
 
     @property
     def score(self) -> int:
-        if not self.winning_draw:
+        if self.winning_draw is None:
             raise RuntimeError("Can't calculate the score without the winning draw")
 
-        unmarked_sum = 0
-        for row in self.rows:
-            for cell in row:
-                if not cell.marked:
-                    unmarked_sum += cell.number
+        return self.unmarked_sum * self.winning_draw
+
+
+@lru_cache(maxsize=None)
+def line_masks(height: int, width: int) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """
+    Cell (row_ix, column_ix) of a BitBoard is bit row_ix * width + column_ix.
+
+    E.g.::
+        line_masks(2, 3)  # => ((0b000111, 0b111000), (0b001001, 0b010010, 0b100100))
+
+    :returns: (row masks, column masks)
+    """
+    row_masks = tuple(((1 << width) - 1) << (row_ix * width) for row_ix in range(height))
+    first_column_mask = sum(1 << (row_ix * width) for row_ix in range(height))
+    column_masks = tuple(first_column_mask << column_ix for column_ix in range(width))
+    return row_masks, column_masks
+
+
+class BitBoard:
+    """
+    A compact board: its numbers are a slice of a flat typed array,
+    which may be shared by many boards, and its marked cells are bits of an int.
+
+    Example::
+        board = BitBoard.from_grid([[1, 2], [3, 4]])
+        board.mark(1)
+        board.mark(3)
+        board.is_winning  # => True
+        board.score  # => 18 = (2 + 4) * 3
+    """
+
+    __slots__ = ("buffer", "offset", "height", "width", "marked", "winning_draw", "_is_winning")
+
+    def __init__(self, buffer: "array[int]", offset: int, height: int, width: int) -> None:
+        self.buffer = buffer
+        self.offset = offset
+        self.height = height
+        self.width = width
+        self.marked = 0
+        self.winning_draw: Optional[int] = None
+        self._is_winning = False
+
+    @classmethod
+    def from_grid(cls, grid: list[list[int]]) -> "BitBoard":
+        buffer = array("q", chain.from_iterable(grid))
+        return cls(buffer, 0, len(grid), len(grid[0]) if grid else 0)
+
+    @property
+    def cells(self) -> "array[int]":
+        """
+        :returns: The numbers of the board row by row.
+        """
+        return self.buffer[self.offset : self.offset + self.height * self.width]
+
+    @property
+    def numbers(self) -> Iterable[int]:
+        """
+        :returns: Every number on the board, once.
+        """
+        return set(self.cells)
 
-        return unmarked_sum * self.winning_draw
+    def mark(self, number: int) -> None:
+        was_winning = self.is_winning
+
+        row_masks, column_masks = line_masks(self.height, self.width)
+        cells = self.cells
+        for cell_ix in compress(range(len(cells)), map(eq, cells, repeat(number))):
+            self.marked |= 1 << cell_ix
+            row_ix, column_ix = divmod(cell_ix, self.width)
+            row_mask, column_mask = row_masks[row_ix], column_masks[column_ix]
+            if self.marked & row_mask == row_mask or self.marked & column_mask == column_mask:
+                self._is_winning = True
+
+        if not was_winning and self.is_winning:
+            self.winning_draw = number
+
+    @property
+    def is_winning(self) -> bool:
+        return self._is_winning
+
+    @property
+    def unmarked_sum(self) -> int:
+        cells = self.cells
+        if not cells:
+            return 0
+
+        # Bit string of the marked cells with cell 0 first
+        marked_bits = format(self.marked, f"0{len(cells)}b")[::-1]
+        return sum(compress(cells, map(eq, marked_bits, repeat("0"))))
+
+    @property
+    def score(self) -> int:
+        if self.winning_draw is None:
+            raise RuntimeError("Can't calculate the score without the winning draw")
+
+        return self.unmarked_sum * self.winning_draw
 
 
 def parse_number_grid(grid_txt: str) -> list[list[int]]:
@@ -109,47 +286,152 @@ def parse_board(board_txt: str) -> Board:
         board = parse_board("1 2\n3 4\n")
         board.rows  # => [[BoardCell(1), BoardCell(2)], [BoardCell(3), BoardCell(4)]]
     """
-    grid = parse_number_grid(board_txt)
-    board = Board(size=len(grid))
-    for row_ix, row in enumerate(grid):
-        for column_ix, number in enumerate(row):
-            board[row_ix, column_ix] = number
+    return board_from_grid(parse_number_grid(board_txt))
+
 
-    return board
+def board_from_grid(grid: list[list[int]]) -> Board:
+    return Board.from_grid(grid)
 
 
-def play_bingo(number_queue: list[int], boards: list[Board]) -> list[Board]:
+def parse_number_grid_into(grid_txt: str, buffer: "array[int]") -> tuple[int, int]:
     """
-    Plays bingo given the queue of drawn numbers and playing board.
+    Same as parse_number_grid, but appends the numbers row by row to the buffer.
+
+    Example::
+        buffer = array("q")
+        parse_number_grid_into("1 2\n3 4\n", buffer)  # => (2, 2)
+        buffer  # => array('q', [1, 2, 3, 4])
+
+    :returns: (height, width) of the grid
+    """
+    height = 0
+    width = 0
+    for line in grid_txt.splitlines():
+        row = line.split()
+        if not row:
+            continue
+
+        if height and len(row) != width:
+            raise ValueError(f"Row {line!r} has {len(row)} numbers, expected {width}")
+
+        buffer.extend(map(int, row))
+        height += 1
+        width = len(row)
+
+    return height, width
+
+
+def parse_bit_board(board_txt: str, buffer: Optional["array[int]"] = None) -> BitBoard:
+    """
+    Parses a board straight into the buffer, or into a buffer of its own if none is given.
+    """
+    if buffer is None:
+        buffer = array("q")
+
+    offset = len(buffer)
+    height, width = parse_number_grid_into(board_txt, buffer)
+    return BitBoard(buffer, offset, height, width)
+
+
+def parse_bit_boards(board_txts: Iterable[str], buffer: Optional["array[int]"] = None) -> list[BitBoard]:
+    """
+    Parses many boards into one shared buffer.
+    """
+    if buffer is None:
+        buffer = array("q")
+
+    return [parse_bit_board(board_txt, buffer) for board_txt in board_txts]
+
+
+class BingoBoard(Protocol):
+    """
+    Interface of Board and BitBoard used by BingoGame.
+    """
+
+    @property
+    def numbers(self) -> Iterable[int]:
+        ...
+
+    @property
+    def is_winning(self) -> bool:
+        ...
+
+    def mark(self, number: int) -> None:
+        ...
+
+
+BoardT = TypeVar("BoardT", bound=BingoBoard)
+
+
+class BingoGame(Generic[BoardT]):
+    """
+    A game of bingo indexing the boards by the numbers on them,
+    so that a draw only visits the boards having the drawn number.
     Winning boards are excluded from the game.
-    The game is played until all the boards have won or until we run out of numbers to draw.
 
-    :returns: The winning boards in the order they have won.
+    Example::
+        game = BingoGame(boards)
+        game.draw(7)  # => The boards that have won on this draw
+        game.won_boards  # => All the boards that have won so far, in order
     """
-    won_boards = []
 
-    for number in number_queue:
-        for board in boards:
-            board.mark(number)
+    def __init__(self, boards: list[BoardT]) -> None:
+        self.boards = boards
+        self.won_boards: list[BoardT] = []
 
-        still_playing_boards = []
+        self._boards_by_number: defaultdict[int, list[BoardT]] = defaultdict(list)
         for board in boards:
+            for number in board.numbers:
+                self._boards_by_number[number].append(board)
+
+    @property
+    def is_over(self) -> bool:
+        return len(self.won_boards) == len(self.boards)
+
+    def draw(self, number: int) -> list[BoardT]:
+        """
+        :returns: The boards that have won on this draw, in the order of self.boards.
+        """
+        drawn_won_boards: list[BoardT] = []
+        for board in self._boards_by_number.get(number, ()):
             if board.is_winning:
-                won_boards.append(board)
-            else:
-                still_playing_boards.append(board)
+                continue
 
-        if not still_playing_boards:
-            break
+            board.mark(number)
+            if board.is_winning:
+                drawn_won_boards.append(board)
 
-        boards = still_playing_boards
+        self.won_boards.extend(drawn_won_boards)
+        return drawn_won_boards
 
-    return won_boards
+    def play(self, number_queue: Iterable[int]) -> list[BoardT]:
+        """
+        Draws the numbers until all the boards have won or until we run out of numbers to draw.
 
+        :returns: The winning boards in the order they have won.
+        """
+        for number in number_queue:
+            if self.is_over:
+                break
+            self.draw(number)
 
-def parse_input(input_txt: str) -> tuple[list[int], list[Board]]:
+        return self.won_boards
+
+
+def play_bingo(number_queue: list[int], boards: list[BoardT]) -> list[BoardT]:
     """
-    :returns: The number drawing queue and the boards.
+    Plays bingo given the queue of drawn numbers and playing board.
+    Winning boards are excluded from the game.
+    The game is played until all the boards have won or until we run out of numbers to draw.
+
+    :returns: The winning boards in the order they have won.
+    """
+    return BingoGame(boards).play(number_queue)
+
+
+def parse_grid_input(input_txt: str) -> tuple[list[int], list[list[list[int]]]]:
+    """
+    :returns: The number drawing queue and the number grids of the boards.
     """
     sections = input_txt.split("\n\n")
 
@@ -157,28 +439,286 @@ def parse_input(input_txt: str) -> tuple[list[int], list[Board]]:
     number_queue = [int(el) for el in number_queue_section.split(",")]
 
     board_sections = sections[1:]
-    boards = [parse_board(board_txt) for board_txt in board_sections]
+    grids = [parse_number_grid(board_txt) for board_txt in board_sections]
+
+    return number_queue, grids
+
+
+def parse_input(input_txt: str) -> tuple[list[int], list[Board]]:
+    """
+    :returns: The number drawing queue and the boards.
+    """
+    number_queue, grids = parse_grid_input(input_txt)
+    return number_queue, [board_from_grid(grid) for grid in grids]
+
+
+@dataclass(frozen=True)
+class BingoWin:
+    board_ix: int
+    draw_ix: int
+    number: int
+    score: int
+
+
+def rank_draws(number_queue: list[int]) -> dict[int, int]:
+    """
+    E.g.::
+        rank_draws([5, 3, 5])  # => {5: 0, 3: 1}
+
+    :returns: The index of the first draw of every number.
+    """
+    draw_ranks: dict[int, int] = {}
+    for draw_ix, number in enumerate(number_queue):
+        draw_ranks.setdefault(number, draw_ix)
+    return draw_ranks
 
-    return number_queue, boards
 
+def compute_bingo_wins(number_queue: list[int], grids: list[list[list[int]]]) -> list[BingoWin]:
+    """
+    Finds the winners of play_bingo without playing the game.
+
+    A line is complete at the latest draw of its numbers,
+    and a board wins at the earliest draw completing one of its lines.
+    The grids may be of any rectangular shape.
+
+    :returns: The wins in the order the boards win.
+    """
+    draw_ranks = rank_draws(number_queue)
+    never = len(number_queue)
+
+    wins = []
+    for board_ix, grid in enumerate(grids):
+        rank_rows = [list(map(draw_ranks.get, row, repeat(never))) for row in grid]
+        line_ranks = chain(map(max, rank_rows), map(max, zip(*rank_rows)))
+        draw_ix = min(line_ranks, default=never)
+        if draw_ix == never:
+            continue
+
+        is_unmarked = map(gt, chain.from_iterable(rank_rows), repeat(draw_ix))
+        unmarked_sum = sum(compress(chain.from_iterable(grid), is_unmarked))
+        number = number_queue[draw_ix]
+        wins.append(BingoWin(board_ix=board_ix, draw_ix=draw_ix, number=number, score=unmarked_sum * number))
+
+    wins.sort(key=attrgetter("draw_ix", "board_ix"))
+    return wins
+
+
+class BingoIndex:
+    """
+    A set of boards indexed once for playing it against many number queues.
 
-def part1(input_txt: str) -> int:
+    Every number maps to the cells having it, and every cell to its board and its two lines.
+    Playing a queue only touches the cells of the drawn numbers
+    and keeps its line hits and marked sums in dicts of its own.
+
+    Example::
+        index = BingoIndex(grids)
+        first_win, last_win = index.play(number_queue)
+        results = index.play_many(shuffled_queues, parallel=True)
+    """
+
+    def __init__(self, grids: list[list[list[int]]]) -> None:
+        self.board_count = len(grids)
+        self.line_sizes: list[int] = []
+        self.board_sums: list[int] = []
+
+        cells_by_number: defaultdict[int, list[tuple[int, int, int]]] = defaultdict(list)
+        for board_ix, grid in enumerate(grids):
+            height = len(grid)
+            width = len(grid[0]) if grid else 0
+            first_row_line = len(self.line_sizes)
+            first_column_line = first_row_line + height
+            self.line_sizes.extend([width] * height + [height] * width)
+            self.board_sums.append(sum(map(sum, grid)))
+
+            for row_ix, row in enumerate(grid):
+                for column_ix, number in enumerate(row):
+                    cells_by_number[number].append((board_ix, first_row_line + row_ix, first_column_line + column_ix))
+
+        self.cells_by_number = dict(cells_by_number)
+
+    def play(self, number_queue: Iterable[int]) -> tuple[Optional[BingoWin], Optional[BingoWin]]:
+        """
+        :returns: The first and the last wins, same as of play_bingo, or None if no board wins.
+        """
+        line_hits: dict[int, int] = {}
+        marked_sums: dict[int, int] = {}
+        won_boards: set[int] = set()
+        drawn_numbers: set[int] = set()
+        first_win: Optional[BingoWin] = None
+        last_win: Optional[BingoWin] = None
+
+        for draw_ix, number in enumerate(number_queue):
+            if number in drawn_numbers:
+                continue
+            drawn_numbers.add(number)
+
+            # A board still gets all of its cells with the number marked on the draw it wins
+            drawn_won_boards = set()
+            for board_ix, row_line, column_line in self.cells_by_number.get(number, ()):
+                if board_ix in won_boards:
+                    continue
+
+                marked_sums[board_ix] = marked_sums.get(board_ix, 0) + number
+                row_hits = line_hits[row_line] = line_hits.get(row_line, 0) + 1
+                column_hits = line_hits[column_line] = line_hits.get(column_line, 0) + 1
+                if row_hits == self.line_sizes[row_line] or column_hits == self.line_sizes[column_line]:
+                    drawn_won_boards.add(board_ix)
+
+            for board_ix in sorted(drawn_won_boards):
+                unmarked_sum = self.board_sums[board_ix] - marked_sums[board_ix]
+                last_win = BingoWin(board_ix=board_ix, draw_ix=draw_ix, number=number, score=unmarked_sum * number)
+                if first_win is None:
+                    first_win = last_win
+
+            won_boards.update(drawn_won_boards)
+            if len(won_boards) == self.board_count:
+                break
+
+        return first_win, last_win
+
+    def play_many(
+        self,
+        number_queues: Iterable[list[int]],
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> list[tuple[Optional[BingoWin], Optional[BingoWin]]]:
+        """
+        Plays every queue against the boards, optionally in a process pool
+        where every worker receives the index once.
+
+        :returns: The first and the last wins for every queue.
+        """
+        if not parallel:
+            return [self.play(number_queue) for number_queue in number_queues]
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_set_worker_bingo_index,
+            initargs=(self,),
+        ) as executor:
+            return list(executor.map(_play_worker_bingo_index, number_queues, chunksize=16))
+
+
+_worker_bingo_index: Optional[BingoIndex] = None
+
+
+def _set_worker_bingo_index(bingo_index: BingoIndex) -> None:
+    global _worker_bingo_index
+    _worker_bingo_index = bingo_index
+
+
+def _play_worker_bingo_index(number_queue: list[int]) -> tuple[Optional[BingoWin], Optional[BingoWin]]:
+    if _worker_bingo_index is None:
+        raise RuntimeError("The worker has no bingo index")
+    return _worker_bingo_index.play(number_queue)
+
+
+def iter_sections(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Lazily splits a stream of lines into sections separated by blank lines.
+
+    E.g.::
+        list(iter_sections(["1,2\n", "\n", "1 2\n", "3 4\n"]))  # => ["1,2\n", "1 2\n3 4\n"]
+    """
+    section: list[str] = []
+    for line in lines:
+        if line.strip():
+            section.append(line)
+        elif section:
+            yield "".join(section)
+            section = []
+
+    if section:
+        yield "".join(section)
+
+
+def _solve_shard(
+    number_queue: list[int],
+    shard: tuple[int, list[str]],
+) -> tuple[Optional[BingoWin], Optional[BingoWin]]:
+    first_board_ix, board_txts = shard
+    grids = [parse_number_grid(board_txt) for board_txt in board_txts]
+    wins = compute_bingo_wins(number_queue, grids)
+    if not wins:
+        return None, None
+
+    first_win, last_win = wins[0], wins[-1]
+    return (
+        replace(first_win, board_ix=first_board_ix + first_win.board_ix),
+        replace(last_win, board_ix=first_board_ix + last_win.board_ix),
+    )
+
+
+def solve_bingo_sharded(
+    input_lines: Iterable[str],
+    shard_size: int = 1000,
+    max_workers: Optional[int] = None,
+) -> tuple[BingoWin, BingoWin]:
+    """
+    Streams the boards from the input in shards to a process pool,
+    where every shard is solved with compute_bingo_wins against the whole number queue.
+    Both parts are answered with a single parse.
+
+    Example::
+        with open("input.txt") as f:
+            first_win, last_win = solve_bingo_sharded(f)
+
+    :returns: The first and the last wins of the game.
+    """
+    sections = iter_sections(input_lines)
+    try:
+        number_queue = [int(el) for el in next(sections).split(",")]
+    except StopIteration:
+        raise ValueError("No number queue") from None
+
+    shards = ((shard_ix * shard_size, board_txts) for shard_ix, board_txts in enumerate(batched(sections, shard_size)))
+    max_pending = 2 * (max_workers or os.cpu_count() or 1)
+
+    first_win: Optional[BingoWin] = None
+    last_win: Optional[BingoWin] = None
+    order = attrgetter("draw_ix", "board_ix")
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for shard_first_win, shard_last_win in imap_bounded(
+            executor, partial(_solve_shard, number_queue), shards, max_pending
+        ):
+            if shard_first_win is not None and (first_win is None or order(shard_first_win) < order(first_win)):
+                first_win = shard_first_win
+            if shard_last_win is not None and (last_win is None or order(shard_last_win) > order(last_win)):
+                last_win = shard_last_win
+
+    if first_win is None or last_win is None:
+        raise ValueError("None of the boards win")
+
+    return first_win, last_win
+
+
+def parse(input_txt: str) -> list[Board]:
+    """
+    Parses the input and plays the game, which both parts share.
+
+    :returns: The winning boards in the order they have won.
+    """
     number_queue, boards = parse_input(input_txt)
-    won_boards = play_bingo(number_queue, boards)
+    return play_bingo(number_queue, boards)
+
+
+def part1(input_txt: Union[str, list[Board]]) -> int:
+    won_boards = ensure_parsed(input_txt, parse)
     return won_boards[0].score
 
 
-def part2(input_txt: str) -> int:
-    number_queue, boards = parse_input(input_txt)
-    won_boards = play_bingo(number_queue, boards)
+def part2(input_txt: Union[str, list[Board]]) -> int:
+    won_boards = ensure_parsed(input_txt, parse)
     return won_boards[-1].score
 
 
 def main() -> None:
     input_txt = read_input_txt(__file__)
+    won_boards = parse(input_txt)
 
-    part1_answer = part1(input_txt)
+    part1_answer = part1(won_boards)
     print("Part 1:", part1_answer)
 
-    part2_answer = part2(input_txt)
+    part2_answer = part2(won_boards)
     print("Part 2:", part2_answer)
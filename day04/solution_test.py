@@ -1,4 +1,23 @@
-from .solution import part1, part2
+from array import array
+
+import pytest
+
+from .solution import (
+    BingoGame,
+    BingoIndex,
+    BingoWin,
+    BitBoard,
+    Board,
+    compute_bingo_wins,
+    parse,
+    parse_bit_boards,
+    parse_grid_input,
+    parse_input,
+    part1,
+    part2,
+    play_bingo,
+    solve_bingo_sharded,
+)
 
 input_txt = (
     "7,4,9,5,11,17,23,2,0,14,21,24,10,16,13,6,15,25,12,22,18,20,8,19,3,26,1\n"
@@ -29,3 +48,114 @@ def test_part1() -> None:
 
 def test_part2() -> None:
     assert part2(input_txt) == 1924
+
+
+def test_board() -> None:
+    board = Board(size=2)
+    board[0, 0] = 1
+    board[0, 1] = 2
+    board[1, 0] = 3
+    board[1, 1] = 4
+
+    board.mark(1)
+    assert not board.is_winning
+    assert board.unmarked_sum == 9
+
+    board.mark(3)
+    assert board.is_winning
+    assert board.score == 18
+
+    board.mark(2)
+    assert board.winning_draw == 3
+
+
+def test_board_from_grid() -> None:
+    board = Board.from_grid([[1, 2, 1], [3, 1, 4], [5, 6, 7]])
+    assert sorted(board.numbers) == [1, 2, 3, 4, 5, 6, 7]
+    assert board.unmarked_sum == 30
+
+    # Moving a cell off a repeated number keeps the other cells of that number
+    board[1, 1] = 8
+    board.mark(1)
+    assert not board.is_winning
+    assert board.unmarked_sum == 35
+    board.mark(2)
+    assert board.is_winning
+    assert board.score == 33 * 2
+
+    with pytest.raises(ValueError):
+        Board.from_grid([[1, 2], [3]])
+
+
+def test_bingo_game() -> None:
+    number_queue, boards = parse_input(input_txt)
+    game = BingoGame(boards)
+    for number in number_queue[:11]:
+        assert game.draw(number) == []
+    assert game.draw(number_queue[11]) == [boards[2]]
+    assert game.play(number_queue[12:]) == [boards[2], boards[0], boards[1]]
+    assert game.is_over
+
+
+def test_compute_bingo_wins() -> None:
+    number_queue, grids = parse_grid_input(input_txt)
+    wins = compute_bingo_wins(number_queue, grids)
+    assert [win.board_ix for win in wins] == [2, 0, 1]
+    assert (wins[0].score, wins[-1].score) == (4512, 1924)
+
+    # A 2x3 board wins on its middle column, a 3x2 board never wins
+    assert compute_bingo_wins([5, 2, 9], [[[1, 2, 3], [4, 5, 6]], [[7, 2], [8, 5], [3, 4]]]) == [
+        BingoWin(board_ix=0, draw_ix=1, number=2, score=(1 + 3 + 4 + 6) * 2)
+    ]
+
+
+def test_bit_board() -> None:
+    number_queue, _ = parse_input(input_txt)
+    boards = parse_bit_boards(input_txt.split("\n\n")[1:])
+    assert len({id(board.buffer) for board in boards}) == 1
+    assert boards[1].cells[:5] == array("q", [3, 15, 0, 2, 22])
+    assert boards[1].cells[-5:] == array("q", [14, 21, 16, 12, 6])
+
+    won_boards = play_bingo(number_queue, boards)
+    assert won_boards == [boards[2], boards[0], boards[1]]
+    assert (won_boards[0].score, won_boards[-1].score) == (4512, 1924)
+
+    board = BitBoard.from_grid([[1, 2, 3], [4, 5, 6]])
+    board.mark(2)
+    board.mark(5)
+    assert board.is_winning
+    assert board.score == (1 + 3 + 4 + 6) * 5
+
+
+def test_solve_bingo_sharded() -> None:
+    input_lines = input_txt.splitlines(keepends=True)
+    first_win, last_win = solve_bingo_sharded(input_lines, shard_size=2, max_workers=2)
+    assert (first_win.board_ix, first_win.score) == (2, 4512)
+    assert (last_win.board_ix, last_win.score) == (1, 1924)
+
+    with pytest.raises(ValueError):
+        solve_bingo_sharded([], max_workers=1)
+
+
+def test_bingo_index() -> None:
+    number_queue, grids = parse_grid_input(input_txt)
+    bingo_index = BingoIndex(grids)
+
+    first_win, last_win = bingo_index.play(number_queue)
+    assert first_win is not None and last_win is not None
+    assert (first_win.board_ix, first_win.score) == (2, 4512)
+    assert (last_win.board_ix, last_win.score) == (1, 1924)
+
+    number_queues = [number_queue, number_queue[::-1], number_queue[:5]]
+    expected = [bingo_index.play(queue) for queue in number_queues]
+    assert expected[2] == (None, None)
+    assert bingo_index.play_many(number_queues, parallel=True, max_workers=2) == expected
+    for queue, (first_win, last_win) in zip(number_queues[:2], expected):
+        wins = compute_bingo_wins(queue, grids)
+        assert (first_win, last_win) == (wins[0], wins[-1])
+
+
+def test_parse() -> None:
+    won_boards = parse(input_txt)
+    assert part1(won_boards) == 4512
+    assert part2(won_boards) == 1924
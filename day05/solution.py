@@ -1,8 +1,18 @@
-from collections import defaultdict
+import mmap
+import os
+import tempfile
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Iterator
+from functools import cached_property
+from itertools import combinations, compress
+from operator import eq, or_, sub
+from types import TracebackType
+from typing import IO, Iterable, Iterator, Optional, Protocol, Union
 
-from common import read_input_txt
+from common import Buffer, ensure_parsed, parse_ints, read_input_txt
 
 
 @dataclass(frozen=True)
@@ -58,6 +68,31 @@ class VentLine:
             x += delta_x
             y += delta_y
 
+    def clip_y(self, min_y: int, max_y: int) -> Optional["VentLine"]:
+        """
+        E.g.::
+            VentLine(Point(0, 0), Point(8, 8)).clip_y(3, 5)  # => VentLine(Point(3, 3), Point(5, 5))
+
+        :returns: The part of the line with min_y <= y <= max_y, or None if there's no such part.
+        """
+        if self.is_horizontal:
+            return self if min_y <= self.start.y <= max_y else None
+
+        delta_x, delta_y, point_count = segment_steps(self.start.x, self.start.y, self.end.x, self.end.y)
+        if delta_y > 0:
+            first_step, last_step = min_y - self.start.y, max_y - self.start.y
+        else:
+            first_step, last_step = self.start.y - max_y, self.start.y - min_y
+
+        first_step, last_step = max(first_step, 0), min(last_step, point_count - 1)
+        if first_step > last_step:
+            return None
+
+        return VentLine(
+            start=Point(self.start.x + delta_x * first_step, self.start.y + delta_y * first_step),
+            end=Point(self.start.x + delta_x * last_step, self.start.y + delta_y * last_step),
+        )
+
 
 def parse_vent_line(line: str) -> VentLine:
     pos1, pos2 = line.split(" -> ")
@@ -74,7 +109,262 @@ def parse_vent_line(line: str) -> VentLine:
     )
 
 
-def count_multiline_points(vent_lines: list[VentLine]) -> int:
+def segment_steps(x1: int, y1: int, x2: int, y2: int) -> tuple[int, int, int]:
+    """
+    E.g.::
+        segment_steps(3, 4, 1, 4)  # => (-1, 0, 3)
+
+    :returns: (delta x, delta y, point count) of walking a line from (x1, y1) to (x2, y2).
+    """
+    width, height = abs(x2 - x1), abs(y2 - y1)
+    if width and height and width != height:
+        raise ValueError(f"The points of this line ({x1},{y1} -> {x2},{y2}) cannot be computed")
+
+    delta_x = (x2 > x1) - (x2 < x1)
+    delta_y = (y2 > y1) - (y2 < y1)
+    return delta_x, delta_y, max(width, height) + 1
+
+
+# Maps a cell's line count to the count with one more line, saturating at 2,
+# which is all it takes to tell cells covered by several lines.
+INCREMENT_TABLE = bytes([1] + [2] * 255)
+
+
+def increment_run(cells: bytearray, start: int, step: int, count: int) -> None:
+    """
+    Adds a line to count cells of a flat grid, starting at index start and going by step,
+    with one slice translation instead of a Python loop over the cells.
+    """
+    if step < 0:
+        start += step * (count - 1)
+        step = -step
+    elif step == 0:
+        step = 1
+
+    run = slice(start, start + step * (count - 1) + 1, step)
+    cells[run] = cells[run].translate(INCREMENT_TABLE)
+
+
+def count_covered_cells(cells: Union[bytes, bytearray]) -> int:
+    """
+    :returns: The number of cells counted by increment_run as covered by several lines.
+    """
+    return len(cells) - cells.count(0) - cells.count(1)
+
+
+class CoverageGrid(Protocol):
+    """
+    Interface of the grids count_multiline_points can run on.
+    """
+
+    def add_line(self, vent_line: VentLine) -> None:
+        ...
+
+    def count_multiline_points(self) -> int:
+        ...
+
+
+class DenseGrid:
+    """
+    Saturating line counts of every cell of a bounding box, in a flat bytearray row by row.
+
+    Example::
+        grid = DenseGrid.for_lines(vent_lines)
+        for vent_line in vent_lines:
+            grid.add_line(vent_line)
+        grid.count_multiline_points()
+    """
+
+    def __init__(self, min_x: int, min_y: int, max_x: int, max_y: int) -> None:
+        self.min_x = min_x
+        self.min_y = min_y
+        self.width = max(max_x - min_x + 1, 0)
+        self.height = max(max_y - min_y + 1, 0)
+        self.cells = bytearray(self.width * self.height)
+
+    @classmethod
+    def for_lines(cls, vent_lines: list[VentLine]) -> "DenseGrid":
+        """
+        :returns: A grid sized to the bounding box of the lines.
+        """
+        if not vent_lines:
+            return cls(0, 0, -1, -1)
+
+        xs = [x for line in vent_lines for x in (line.start.x, line.end.x)]
+        ys = [y for line in vent_lines for y in (line.start.y, line.end.y)]
+        return cls(min(xs), min(ys), max(xs), max(ys))
+
+    def cell_ix(self, x: int, y: int) -> int:
+        column_ix, row_ix = x - self.min_x, y - self.min_y
+        if not (0 <= column_ix < self.width and 0 <= row_ix < self.height):
+            raise ValueError(f"The point ({x},{y}) is out of the grid")
+        return row_ix * self.width + column_ix
+
+    def add_segment(self, x1: int, y1: int, x2: int, y2: int) -> None:
+        delta_x, delta_y, point_count = segment_steps(x1, y1, x2, y2)
+        start = self.cell_ix(x1, y1)
+        self.cell_ix(x2, y2)
+        increment_run(self.cells, start, delta_y * self.width + delta_x, point_count)
+
+    def add_line(self, vent_line: VentLine) -> None:
+        self.add_segment(vent_line.start.x, vent_line.start.y, vent_line.end.x, vent_line.end.y)
+
+    def count_multiline_points(self) -> int:
+        return count_covered_cells(self.cells)
+
+
+class TiledGrid:
+    """
+    Saturating line counts split into square tiles, which are only allocated once a line reaches them.
+    Works for any coordinates, with memory proportional to the tiles touched.
+
+    With max_tiles_in_memory set, the least recently used tiles are evicted
+    to a memory-mapped scratch file and loaded back once a line reaches them again,
+    so the memory taken by tiles never exceeds max_tiles_in_memory * tile_size ** 2 bytes.
+
+    Example::
+        with TiledGrid(tile_size=1024, max_tiles_in_memory=64) as grid:
+            count_multiline_points(vent_lines, grid)
+    """
+
+    def __init__(
+        self,
+        tile_size: int = 256,
+        max_tiles_in_memory: Optional[int] = None,
+        scratch_dir: Optional[str] = None,
+    ) -> None:
+        if tile_size < 1:
+            raise ValueError(tile_size)
+        if max_tiles_in_memory is not None and max_tiles_in_memory < 1:
+            raise ValueError(max_tiles_in_memory)
+
+        self.tile_size = tile_size
+        self.max_tiles_in_memory = max_tiles_in_memory
+        self.scratch_dir = scratch_dir
+
+        # Tiles in memory, least recently used first
+        self.tiles: OrderedDict[tuple[int, int], bytearray] = OrderedDict()
+        # Slots of the tiles that have ever been evicted to the scratch file
+        self.scratch_slots: dict[tuple[int, int], int] = {}
+
+        self._scratch_file: Optional[IO[bytes]] = None
+        self._scratch: Optional[mmap.mmap] = None
+
+    @property
+    def tile_bytes(self) -> int:
+        return self.tile_size * self.tile_size
+
+    def __enter__(self) -> "TiledGrid":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._scratch is not None:
+            self._scratch.close()
+            self._scratch = None
+        if self._scratch_file is not None:
+            self._scratch_file.close()
+            self._scratch_file = None
+
+    def _scratch_tile(self, slot: int) -> bytes:
+        if self._scratch is None:
+            raise RuntimeError("The scratch file is closed")
+        return self._scratch[slot * self.tile_bytes : (slot + 1) * self.tile_bytes]
+
+    def _reserve_scratch(self, slot_count: int) -> mmap.mmap:
+        """
+        Grows the scratch file, doubling it, until it has room for slot_count tiles.
+        """
+        if self._scratch_file is None:
+            self._scratch_file = tempfile.TemporaryFile(dir=self.scratch_dir)
+
+        size = len(self._scratch) if self._scratch is not None else 0
+        if size < slot_count * self.tile_bytes:
+            if self._scratch is not None:
+                self._scratch.close()
+            size = max(size * 2, slot_count * self.tile_bytes)
+            self._scratch_file.truncate(size)
+            self._scratch = mmap.mmap(self._scratch_file.fileno(), size)
+
+        assert self._scratch is not None
+        return self._scratch
+
+    def _evict(self) -> None:
+        while self.max_tiles_in_memory is not None and len(self.tiles) > self.max_tiles_in_memory:
+            tile_key, tile = self.tiles.popitem(last=False)
+            slot = self.scratch_slots.setdefault(tile_key, len(self.scratch_slots))
+            scratch = self._reserve_scratch(slot + 1)
+            scratch[slot * self.tile_bytes : (slot + 1) * self.tile_bytes] = tile
+
+    def tile(self, tile_key: tuple[int, int]) -> bytearray:
+        """
+        :returns: The tile with the given (x, y) tile coordinates, allocating or loading it if needed.
+        """
+        tile = self.tiles.get(tile_key)
+        if tile is not None:
+            self.tiles.move_to_end(tile_key)
+            return tile
+
+        slot = self.scratch_slots.get(tile_key)
+        if slot is None:
+            tile = bytearray(self.tile_bytes)
+        else:
+            tile = bytearray(self._scratch_tile(slot))
+
+        self.tiles[tile_key] = tile
+        self._evict()
+        return tile
+
+    def add_segment(self, x1: int, y1: int, x2: int, y2: int) -> None:
+        delta_x, delta_y, remaining = segment_steps(x1, y1, x2, y2)
+        x, y = x1, y1
+        size = self.tile_size
+        while remaining:
+            tile_x, local_x = divmod(x, size)
+            tile_y, local_y = divmod(y, size)
+
+            # The number of points before the line leaves the tile
+            count = remaining
+            if delta_x:
+                count = min(count, size - local_x if delta_x > 0 else local_x + 1)
+            if delta_y:
+                count = min(count, size - local_y if delta_y > 0 else local_y + 1)
+
+            tile = self.tile((tile_x, tile_y))
+            increment_run(tile, local_y * size + local_x, delta_y * size + delta_x, count)
+
+            x += delta_x * count
+            y += delta_y * count
+            remaining -= count
+
+    def add_line(self, vent_line: VentLine) -> None:
+        self.add_segment(vent_line.start.x, vent_line.start.y, vent_line.end.x, vent_line.end.y)
+
+    def count_multiline_points(self) -> int:
+        multiline_point_count = sum(count_covered_cells(tile) for tile in self.tiles.values())
+        for tile_key, slot in self.scratch_slots.items():
+            if tile_key not in self.tiles:
+                multiline_point_count += count_covered_cells(self._scratch_tile(slot))
+        return multiline_point_count
+
+
+def count_multiline_points(vent_lines: list[VentLine], grid: Optional[CoverageGrid] = None) -> int:
+    """
+    :param grid: Counts the points on the given grid instead of a dict of the covered points,
+        e.g. on DenseGrid.for_lines(vent_lines) or on TiledGrid().
+    """
+    if grid is not None:
+        for vent_line in vent_lines:
+            grid.add_line(vent_line)
+        return grid.count_multiline_points()
+
     covered_points: defaultdict[Point, int] = defaultdict(int)
     for vent_line in vent_lines:
         for point in vent_line.points:
@@ -88,22 +378,489 @@ def count_multiline_points(vent_lines: list[VentLine]) -> int:
     return multiline_point_count
 
 
-def part1(input_txt: str) -> int:
-    vent_lines = [parse_vent_line(line) for line in input_txt.splitlines()]
-    right_vent_lines = [line for line in vent_lines if line.is_horizontal or line.is_vertical]
-    return count_multiline_points(right_vent_lines)
+@dataclass(frozen=True)
+class Region:
+    """
+    A rectangle of points, bounds included.
+    """
+
+    min_x: int
+    min_y: int
+    max_x: int
+    max_y: int
+
+    def __contains__(self, point: Point) -> bool:
+        return self.min_x <= point.x <= self.max_x and self.min_y <= point.y <= self.max_y
+
+
+class PointCoverage:
+    """
+    Line counts of the covered points, along with the set of the points covered by several lines.
+    """
+
+    def __init__(self) -> None:
+        self.line_counts: defaultdict[Point, int] = defaultdict(int)
+        self.multiline_points: set[Point] = set()
+
+    def add(self, points: list[Point]) -> None:
+        for point in points:
+            self.line_counts[point] += 1
+            if self.line_counts[point] == 2:
+                self.multiline_points.add(point)
+
+    def remove(self, points: list[Point]) -> None:
+        for point in points:
+            self.line_counts[point] -= 1
+            if self.line_counts[point] == 1:
+                self.multiline_points.discard(point)
+            elif self.line_counts[point] == 0:
+                del self.line_counts[point]
+
+
+class VentMap:
+    """
+    A changing set of vent lines with the multiline points kept up to date,
+    so that adding or removing a line only costs as much as the line is long.
+    Horizontal and vertical lines are also counted on their own for part 1 style queries.
+
+    Example::
+        vent_map = VentMap()
+        vent_map.add_line(parse_vent_line("0,9 -> 5,9"))
+        vent_map.add_line(parse_vent_line("0,9 -> 2,9"))
+        vent_map.count_multiline_points()  # => 3
+        vent_map.count_multiline_points(region=Region(0, 0, 1, 9))  # => 2
+        vent_map.remove_line(parse_vent_line("0,9 -> 2,9"))
+        vent_map.count_multiline_points()  # => 0
+    """
+
+    def __init__(self, vent_lines: Iterable[VentLine] = ()) -> None:
+        self.line_counts: Counter[tuple[Point, Point]] = Counter()
+        self.all_coverage = PointCoverage()
+        self.right_coverage = PointCoverage()
+        for vent_line in vent_lines:
+            self.add_line(vent_line)
+
+    @property
+    def vent_lines(self) -> Iterator[VentLine]:
+        for (start, end), line_count in self.line_counts.items():
+            for _ in range(line_count):
+                yield VentLine(start=start, end=end)
+
+    @staticmethod
+    def _line_key(vent_line: VentLine) -> tuple[Point, Point]:
+        # A line covers the same points whichever end it starts from
+        start, end = vent_line.start, vent_line.end
+        return (start, end) if (start.x, start.y) <= (end.x, end.y) else (end, start)
+
+    def add_line(self, vent_line: VentLine) -> None:
+        points = list(vent_line.points)
+        self.line_counts[self._line_key(vent_line)] += 1
+        self.all_coverage.add(points)
+        if vent_line.is_horizontal or vent_line.is_vertical:
+            self.right_coverage.add(points)
+
+    def remove_line(self, vent_line: VentLine) -> None:
+        line_key = self._line_key(vent_line)
+        if not self.line_counts[line_key]:
+            raise ValueError(f"There's no line {vent_line} on the map")
+
+        self.line_counts[line_key] -= 1
+        if not self.line_counts[line_key]:
+            del self.line_counts[line_key]
+
+        points = list(vent_line.points)
+        self.all_coverage.remove(points)
+        if vent_line.is_horizontal or vent_line.is_vertical:
+            self.right_coverage.remove(points)
+
+    def multiline_points(self, include_diagonal: bool = True) -> set[Point]:
+        coverage = self.all_coverage if include_diagonal else self.right_coverage
+        return coverage.multiline_points
+
+    def count_multiline_points(self, region: Optional[Region] = None, include_diagonal: bool = True) -> int:
+        """
+        :param region: Only counts the points within the region.
+        :param include_diagonal: Only counts horizontal and vertical lines if False.
+        """
+        multiline_points = self.multiline_points(include_diagonal)
+        if region is None:
+            return len(multiline_points)
+        return sum(1 for point in multiline_points if point in region)
+
+
+def _count_stripe(vent_lines: list[VentLine]) -> int:
+    return count_multiline_points(vent_lines, DenseGrid.for_lines(vent_lines))
+
+
+def count_multiline_points_striped(
+    vent_lines: list[VentLine],
+    stripe_count: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> int:
+    """
+    Same as count_multiline_points, but the y range is split into horizontal stripes,
+    every line is clipped to the stripes it crosses, and every stripe is counted
+    on a DenseGrid of its own in a process pool.
+    """
+    if not vent_lines:
+        return 0
+
+    if stripe_count is None:
+        stripe_count = max_workers or os.cpu_count() or 1
+    elif stripe_count < 1:
+        raise ValueError(stripe_count)
+
+    min_y = min(min(line.start.y, line.end.y) for line in vent_lines)
+    max_y = max(max(line.start.y, line.end.y) for line in vent_lines)
+    stripe_height = -(-(max_y - min_y + 1) // stripe_count)
+
+    stripes: list[list[VentLine]] = [[] for _ in range(stripe_count)]
+    for vent_line in vent_lines:
+        line_min_y = min(vent_line.start.y, vent_line.end.y)
+        line_max_y = max(vent_line.start.y, vent_line.end.y)
+        for stripe_ix in range((line_min_y - min_y) // stripe_height, (line_max_y - min_y) // stripe_height + 1):
+            stripe_min_y = min_y + stripe_ix * stripe_height
+            clipped_line = vent_line.clip_y(stripe_min_y, stripe_min_y + stripe_height - 1)
+            if clipped_line is not None:
+                stripes[stripe_ix].append(clipped_line)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return sum(executor.map(_count_stripe, stripes))
+
+
+@dataclass(frozen=True)
+class LineFamily:
+    """
+    Lines of one direction. Every line of the family is the set of points
+    where x_coef * x + y_coef * y equals the line's key.
+    A point on a line is located by its x, or by its y for vertical lines.
+    """
+
+    name: str
+    x_coef: int
+    y_coef: int
+
+    def key(self, x: int, y: int) -> int:
+        return self.x_coef * x + self.y_coef * y
+
+    def param(self, x: int, y: int) -> int:
+        return y if self.y_coef == 0 else x
+
+    def point(self, key: int, param: int) -> tuple[int, int]:
+        if self.y_coef == 0:
+            return key, param
+        return param, (key - self.x_coef * param) // self.y_coef
+
+
+HORIZONTAL = LineFamily("horizontal", 0, 1)
+VERTICAL = LineFamily("vertical", 1, 0)
+RISING = LineFamily("rising", -1, 1)
+FALLING = LineFamily("falling", 1, 1)
+FAMILIES = (HORIZONTAL, VERTICAL, RISING, FALLING)
+
+# Disjoint sorted inclusive (start, end) ranges of params, by line key
+IntervalMap = dict[int, list[tuple[int, int]]]
+
+
+def classify_segment(x1: int, y1: int, x2: int, y2: int) -> tuple[LineFamily, int, int, int]:
+    """
+    E.g.::
+        classify_segment(5, 9, 0, 9)  # => (HORIZONTAL, 9, 0, 5)
+
+    :returns: (family, key, first param, last param) of a line
+    """
+    if y1 == y2:
+        family = HORIZONTAL
+    elif x1 == x2:
+        family = VERTICAL
+    elif x2 - x1 == y2 - y1:
+        family = RISING
+    elif x2 - x1 == y1 - y2:
+        family = FALLING
+    else:
+        raise ValueError(f"The points of this line ({x1},{y1} -> {x2},{y2}) cannot be computed")
+
+    param1, param2 = family.param(x1, y1), family.param(x2, y2)
+    return family, family.key(x1, y1), min(param1, param2), max(param1, param2)
+
+
+def cover_intervals(intervals: list[tuple[int, int]]) -> tuple[list[tuple[int, int]], list[tuple[int, int]]]:
+    """
+    E.g.::
+        cover_intervals([(0, 5), (3, 8), (10, 10)])  # => ([(0, 8), (10, 10)], [(3, 5)])
+
+    :returns: (ranges covered by any interval, ranges covered by two or more intervals)
+    """
+    events = sorted([(start, 1) for start, _ in intervals] + [(end + 1, -1) for _, end in intervals])
+
+    covered: list[tuple[int, int]] = []
+    multi_covered: list[tuple[int, int]] = []
+
+    def add_range(ranges: list[tuple[int, int]], start: int, end: int) -> None:
+        if ranges and ranges[-1][1] == start - 1:
+            ranges[-1] = (ranges[-1][0], end)
+        else:
+            ranges.append((start, end))
+
+    depth = 0
+    prev_pos = 0
+    for pos, delta in events:
+        if pos > prev_pos:
+            if depth >= 1:
+                add_range(covered, prev_pos, pos - 1)
+            if depth >= 2:
+                add_range(multi_covered, prev_pos, pos - 1)
+        depth += delta
+        prev_pos = pos
+
+    return covered, multi_covered
+
+
+def find_crossings(
+    family_a: LineFamily,
+    covered_a: IntervalMap,
+    family_b: LineFamily,
+    covered_b: IntervalMap,
+) -> set[tuple[int, int]]:
+    """
+    Sweeps over the keys of family A. Every B interval is active between the A keys
+    of its ends, and every A interval looks up the active B intervals
+    with keys between the B keys of its ends.
+
+    :returns: The points covered by both an A interval and a B interval.
+    """
+    # Events are (A key, kind, B key or keys, id), where adding goes before querying before removing
+    add, query, remove = 0, 1, 2
+    events: list[tuple[int, int, int, int]] = []
+    for key_b, intervals in covered_b.items():
+        for start, end in intervals:
+            key_a_start = family_a.key(*family_b.point(key_b, start))
+            key_a_end = family_a.key(*family_b.point(key_b, end))
+            interval_id = len(events)
+            events.append((min(key_a_start, key_a_end), add, key_b, interval_id))
+            events.append((max(key_a_start, key_a_end), remove, key_b, interval_id))
+
+    for key_a, intervals in covered_a.items():
+        for start, end in intervals:
+            key_b_start = family_b.key(*family_a.point(key_a, start))
+            key_b_end = family_b.key(*family_a.point(key_a, end))
+            events.append((key_a, query, min(key_b_start, key_b_end), max(key_b_start, key_b_end)))
+
+    determinant = family_a.x_coef * family_b.y_coef - family_a.y_coef * family_b.x_coef
+    crossings = set()
+    active: list[tuple[int, int]] = []
+    for key_a, kind, arg1, arg2 in sorted(events):
+        if kind == add:
+            insort(active, (arg1, arg2))
+        elif kind == remove:
+            del active[bisect_left(active, (arg1, arg2))]
+        else:
+            # All the active (B key, id) with arg1 <= B key <= arg2
+            for key_b, _ in active[bisect_left(active, (arg1,)) : bisect_left(active, (arg2 + 1,))]:
+                # The crossing of the two lines, if it is a whole point
+                x_numerator = key_a * family_b.y_coef - family_a.y_coef * key_b
+                y_numerator = family_a.x_coef * key_b - family_b.x_coef * key_a
+                if x_numerator % determinant == 0 and y_numerator % determinant == 0:
+                    crossings.add((x_numerator // determinant, y_numerator // determinant))
+
+    return crossings
+
+
+def is_in_intervals(interval_map: IntervalMap, key: int, param: int) -> bool:
+    intervals = interval_map.get(key, [])
+    # The last interval starting at or before param
+    interval_ix = bisect_left(intervals, (param + 1,)) - 1
+    return interval_ix >= 0 and intervals[interval_ix][1] >= param
+
+
+def count_multiline_points_sweep(vent_lines: list[VentLine]) -> int:
+    """
+    Same as count_multiline_points, but computed from the line ends without visiting the points,
+    so it only depends on the number of lines and their crossings.
+
+    Lines of the same family only overlap along the same key, where the overlaps are found
+    by sweeping the intervals. Lines of different families only meet at single crossing points.
+    """
+    intervals_by_family: dict[LineFamily, defaultdict[int, list[tuple[int, int]]]] = {
+        family: defaultdict(list) for family in FAMILIES
+    }
+    for vent_line in vent_lines:
+        line_start, line_end = vent_line.start, vent_line.end
+        family, key, start, end = classify_segment(line_start.x, line_start.y, line_end.x, line_end.y)
+        intervals_by_family[family][key].append((start, end))
+
+    covered: dict[LineFamily, IntervalMap] = {}
+    multi_covered: dict[LineFamily, IntervalMap] = {}
+    multiline_point_count = 0
+    for family, intervals_by_key in intervals_by_family.items():
+        covered[family] = {}
+        multi_covered[family] = {}
+        for key, intervals in intervals_by_key.items():
+            covered[family][key], multi_covered[family][key] = cover_intervals(intervals)
+            multiline_point_count += sum(end - start + 1 for start, end in multi_covered[family][key])
+
+    crossings: set[tuple[int, int]] = set()
+    for family_a, family_b in combinations(FAMILIES, 2):
+        crossings |= find_crossings(family_a, covered[family_a], family_b, covered[family_b])
+
+    # A crossing is a multiline point counted once, however many families it's multi-covered in
+    for x, y in crossings:
+        multiline_point_count += 1
+        for family in FAMILIES:
+            if is_in_intervals(multi_covered[family], family.key(x, y), family.param(x, y)):
+                multiline_point_count -= 1
+
+    return multiline_point_count
+
+
+# VentLineColumns.count_multiline_points only allocates a DenseGrid
+# for bounding boxes up to this many cells per point on the lines, or up to the minimum area.
+DENSE_GRID_AREA_PER_POINT = 16
+DENSE_GRID_MIN_AREA = 1 << 20
+
+
+class VentLineColumns:
+    """
+    The ends of all the vent lines in one flat array, 4 numbers (x1, y1, x2, y2) per line,
+    with every column sliced out and the lines classified by byte masks all at once.
+
+    Example::
+        columns = parse_vent_line_columns("0,9 -> 5,9\n2,2 -> 2,1\n")
+        columns.x1s  # => array('q', [0, 2])
+        columns.vertical_mask  # => b"\\x00\\x01"
+        list(columns.segments(columns.vertical_mask))  # => [(2, 2, 2, 1)]
+    """
+
+    def __init__(self, coords: "array[int]") -> None:
+        if len(coords) % 4:
+            raise ValueError(f"{len(coords)} numbers don't make up whole lines")
+
+        self.coords = coords
+        self.x1s, self.y1s, self.x2s, self.y2s = (coords[column_ix::4] for column_ix in range(4))
+
+    def __len__(self) -> int:
+        return len(self.x1s)
+
+    @cached_property
+    def horizontal_mask(self) -> bytes:
+        return bytes(map(eq, self.y1s, self.y2s))
+
+    @cached_property
+    def vertical_mask(self) -> bytes:
+        return bytes(map(eq, self.x1s, self.x2s))
+
+    @cached_property
+    def diagonal_mask(self) -> bytes:
+        widths = map(abs, map(sub, self.x2s, self.x1s))
+        heights = map(abs, map(sub, self.y2s, self.y1s))
+        return bytes(map(eq, widths, heights))
+
+    @cached_property
+    def right_mask(self) -> bytes:
+        """
+        Horizontal and vertical lines.
+        """
+        return bytes(map(or_, self.horizontal_mask, self.vertical_mask))
+
+    def segments(self, mask: Optional[bytes] = None) -> Iterator[tuple[int, int, int, int]]:
+        """
+        :returns: (x1, y1, x2, y2) of the lines selected by the mask, or of all the lines.
+        """
+        segments = zip(self.x1s, self.y1s, self.x2s, self.y2s)
+        if mask is None:
+            return segments
+        return compress(segments, mask)
+
+    def bounding_box(self, mask: Optional[bytes] = None) -> tuple[int, int, int, int]:
+        """
+        :returns: (min_x, min_y, max_x, max_y) of the lines selected by the mask, or of all the lines.
+            (0, 0, -1, -1) if there are no lines.
+        """
+        xs, ys = self.x1s + self.x2s, self.y1s + self.y2s
+        if mask is not None:
+            xs, ys = array("q", compress(xs, mask * 2)), array("q", compress(ys, mask * 2))
+
+        if not xs:
+            return 0, 0, -1, -1
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def point_count(self, mask: Optional[bytes] = None) -> int:
+        """
+        :returns: The number of points on the lines selected by the mask, or on all the lines,
+            counting the shared points once per line.
+        """
+        widths = map(abs, map(sub, self.x2s, self.x1s))
+        heights = map(abs, map(sub, self.y2s, self.y1s))
+        lengths: Iterable[int] = map(max, widths, heights)
+        if mask is not None:
+            lengths = compress(lengths, mask)
+
+        line_count = 0
+        step_count = 0
+        for length in lengths:
+            line_count += 1
+            step_count += length
+        return line_count + step_count
+
+    def dense_grid(self, mask: Optional[bytes] = None) -> DenseGrid:
+        """
+        :returns: A grid sized to the bounding box of the lines selected by the mask, or of all the lines.
+        """
+        return DenseGrid(*self.bounding_box(mask))
+
+    def count_multiline_points(self, mask: Optional[bytes] = None) -> int:
+        """
+        Same as count_multiline_points for the lines selected by the mask, or for all the lines.
+
+        The lines are rasterized on a DenseGrid unless they are too sparse for their bounding box,
+        in which case they are counted with count_multiline_points_sweep.
+        """
+        min_x, min_y, max_x, max_y = self.bounding_box(mask)
+        area = max(max_x - min_x + 1, 0) * max(max_y - min_y + 1, 0)
+        if area > max(DENSE_GRID_MIN_AREA, DENSE_GRID_AREA_PER_POINT * self.point_count(mask)):
+            return count_multiline_points_sweep(
+                [VentLine(start=Point(x1, y1), end=Point(x2, y2)) for x1, y1, x2, y2 in self.segments(mask)]
+            )
+
+        grid = DenseGrid(min_x, min_y, max_x, max_y)
+        for x1, y1, x2, y2 in self.segments(mask):
+            grid.add_segment(x1, y1, x2, y2)
+        return grid.count_multiline_points()
+
+
+def parse_vent_line_columns(input_txt: Union[str, Buffer]) -> VentLineColumns:
+    """
+    Parses all the lines at once, without an object per line.
+
+    :param input_txt: The input text, or its raw bytes, e.g. memory-mapped with map_input_txt.
+    """
+    if not isinstance(input_txt, str):
+        return VentLineColumns(parse_ints(input_txt))
+
+    coords_txt = input_txt.replace("->", ",").replace(",", " ")
+    return VentLineColumns(array("q", map(int, coords_txt.split())))
+
+
+def parse(input_txt: str) -> VentLineColumns:
+    return parse_vent_line_columns(input_txt)
+
+
+def part1(input_txt: Union[str, VentLineColumns]) -> int:
+    vent_line_columns = ensure_parsed(input_txt, parse)
+    return vent_line_columns.count_multiline_points(vent_line_columns.right_mask)
 
 
-def part2(input_txt: str) -> int:
-    vent_lines = [parse_vent_line(line) for line in input_txt.splitlines()]
-    return count_multiline_points(vent_lines)
+def part2(input_txt: Union[str, VentLineColumns]) -> int:
+    vent_line_columns = ensure_parsed(input_txt, parse)
+    return vent_line_columns.count_multiline_points()
 
 
 def main() -> None:
     input_txt = read_input_txt(__file__)
+    vent_line_columns = parse(input_txt)
 
-    part1_answer = part1(input_txt)
+    part1_answer = part1(vent_line_columns)
     print("Part 1:", part1_answer)
 
-    part2_answer = part2(input_txt)
+    part2_answer = part2(vent_line_columns)
     print("Part 2:", part2_answer)
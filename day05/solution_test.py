@@ -1,4 +1,20 @@
-from .solution import part1, part2
+import pytest
+
+from .solution import (
+    DenseGrid,
+    Region,
+    TiledGrid,
+    VentLine,
+    VentMap,
+    count_multiline_points,
+    count_multiline_points_striped,
+    count_multiline_points_sweep,
+    parse,
+    parse_vent_line,
+    parse_vent_line_columns,
+    part1,
+    part2,
+)
 
 input_txt = (
     "0,9 -> 5,9\n"
@@ -20,3 +36,124 @@ def test_part1() -> None:
 
 def test_part2() -> None:
     assert part2(input_txt) == 12
+
+
+def test_dense_grid() -> None:
+    vent_lines = [parse_vent_line(line) for line in input_txt.splitlines()]
+    right_vent_lines = [line for line in vent_lines if line.is_horizontal or line.is_vertical]
+    assert count_multiline_points(right_vent_lines, DenseGrid.for_lines(right_vent_lines)) == 5
+    assert count_multiline_points(vent_lines, DenseGrid.for_lines(vent_lines)) == 12
+
+    grid = DenseGrid(-2, -2, 2, 2)
+    for _ in range(300):
+        grid.add_segment(2, -2, -2, 2)
+    grid.add_segment(0, 0, 0, 0)
+    assert grid.count_multiline_points() == 5
+
+    with pytest.raises(ValueError):
+        grid.add_segment(0, 0, 1, 2)
+    with pytest.raises(ValueError):
+        grid.add_segment(0, 0, 3, 0)
+
+
+def test_count_multiline_points_sweep() -> None:
+    vent_lines = [parse_vent_line(line) for line in input_txt.splitlines()]
+    right_vent_lines = [line for line in vent_lines if line.is_horizontal or line.is_vertical]
+    assert count_multiline_points_sweep(right_vent_lines) == 5
+    assert count_multiline_points_sweep(vent_lines) == 12
+
+    huge_vent_lines = [
+        parse_vent_line("0,0 -> 3000000000,0"),
+        parse_vent_line("1000000000,0 -> 4000000000,0"),
+        parse_vent_line("2000000000,-5 -> 2000000000,5"),
+        parse_vent_line("1999999999,1 -> 2000000001,-1"),
+        parse_vent_line("1999999999,-1 -> 2000000001,1"),
+    ]
+    # The overlap of the horizontal lines, where the other three lines meet as well
+    assert count_multiline_points_sweep(huge_vent_lines) == 2000000001
+
+
+def test_tiled_grid() -> None:
+    vent_lines = [parse_vent_line(line) for line in input_txt.splitlines()]
+    with TiledGrid(tile_size=3, max_tiles_in_memory=2) as grid:
+        assert count_multiline_points(vent_lines, grid) == 12
+        assert len(grid.tiles) == 2
+        assert grid.scratch_slots
+
+    shifted_vent_lines = [parse_vent_line("-10,-10 -> 10,10"), parse_vent_line("10,-10 -> -10,10")]
+    with TiledGrid(tile_size=4, max_tiles_in_memory=1) as grid:
+        assert count_multiline_points(shifted_vent_lines * 2, grid) == 41
+
+
+def test_count_multiline_points_striped() -> None:
+    vent_lines = [parse_vent_line(line) for line in input_txt.splitlines()]
+    right_vent_lines = [line for line in vent_lines if line.is_horizontal or line.is_vertical]
+    assert count_multiline_points_striped(right_vent_lines, stripe_count=3, max_workers=2) == 5
+    assert count_multiline_points_striped(vent_lines, stripe_count=4, max_workers=2) == 12
+    assert count_multiline_points_striped(vent_lines, stripe_count=20, max_workers=2) == 12
+    with pytest.raises(ValueError):
+        count_multiline_points_striped(vent_lines, stripe_count=0)
+    with pytest.raises(ValueError):
+        count_multiline_points_striped(vent_lines, stripe_count=-1)
+
+    assert vent_lines[1].clip_y(3, 5) == parse_vent_line("5,3 -> 3,5")
+    assert vent_lines[0].clip_y(0, 8) is None
+
+
+def test_vent_map() -> None:
+    vent_lines = [parse_vent_line(line) for line in input_txt.splitlines()]
+    vent_map = VentMap(vent_lines)
+    assert vent_map.count_multiline_points() == 12
+    assert vent_map.count_multiline_points(include_diagonal=False) == 5
+    assert vent_map.count_multiline_points(region=Region(0, 0, 4, 4)) == 3
+
+    vent_map.add_line(vent_lines[8])
+    assert vent_map.count_multiline_points() == count_multiline_points(vent_lines + [vent_lines[8]])
+
+    vent_map.remove_line(vent_lines[8])
+    vent_map.remove_line(vent_lines[8])
+    remaining_vent_lines = vent_lines[:8] + vent_lines[9:]
+    assert vent_map.count_multiline_points() == count_multiline_points(remaining_vent_lines)
+    assert len(list(vent_map.vent_lines)) == 9
+
+    with pytest.raises(ValueError):
+        vent_map.remove_line(vent_lines[8])
+
+    reversed_line = VentLine(start=vent_lines[0].end, end=vent_lines[0].start)
+    vent_map.remove_line(reversed_line)
+    assert vent_map.count_multiline_points() == count_multiline_points(remaining_vent_lines[1:])
+    assert len(vent_map.line_counts) == 8
+
+
+def test_vent_line_columns() -> None:
+    vent_lines = [parse_vent_line(line) for line in input_txt.splitlines()]
+    columns = parse_vent_line_columns(input_txt)
+    assert len(columns) == 10
+    assert list(columns.segments()) == [(line.start.x, line.start.y, line.end.x, line.end.y) for line in vent_lines]
+    assert list(columns.horizontal_mask) == [line.is_horizontal for line in vent_lines]
+    assert list(columns.vertical_mask) == [line.is_vertical for line in vent_lines]
+    assert list(columns.diagonal_mask) == [line.is_diagonal for line in vent_lines]
+    assert columns.count_multiline_points(columns.right_mask) == 5
+    diagonal_vent_lines = [line for line in vent_lines if line.is_diagonal]
+    assert columns.count_multiline_points(columns.diagonal_mask) == count_multiline_points(diagonal_vent_lines)
+
+    assert parse_vent_line_columns(input_txt.encode()).coords == columns.coords
+
+    with pytest.raises(ValueError):
+        parse_vent_line_columns("0,9 -> 5,9\n2,2 -> 2\n")
+
+
+def test_vent_line_columns_sparse() -> None:
+    # The bounding box is far too large to rasterize densely
+    sparse_input_txt = "0,0 -> 0,1\n0,0 -> 1,0\n200000,200000 -> 200000,200001\n200000,200001 -> 199999,200002\n"
+    vent_lines = [parse_vent_line(line) for line in sparse_input_txt.splitlines()]
+    columns = parse_vent_line_columns(sparse_input_txt)
+    assert columns.point_count() == 8
+    assert part1(columns) == 1
+    assert part2(columns) == count_multiline_points(vent_lines) == 2
+
+
+def test_parse() -> None:
+    vent_line_columns = parse(input_txt)
+    assert part1(vent_line_columns) == 5
+    assert part2(vent_line_columns) == 12
@@ -1,11 +1,24 @@
 from importlib import import_module
-from typing import Optional, Protocol, runtime_checkable
+from typing import Any, Optional, Protocol, runtime_checkable
 
 from invoke import Context, task
 
 
 @runtime_checkable
 class SolutionModule(Protocol):
+    """
+    parse runs once per input, and part1 and part2 take either its result or the input text.
+    """
+
+    def parse(self, input_txt: str) -> Any:
+        ...
+
+    def part1(self, input_txt: Any) -> Any:
+        ...
+
+    def part2(self, input_txt: Any) -> Any:
+        ...
+
     def main(self) -> None:
         ...
 
@@ -81,27 +94,78 @@ def lint(ctx):
         print("=== FAIL ===")
 
 
+@task
+def bench(ctx, day=None, sizes="3,4,5", repeat=3, seed=2021, output="bench_results.json", baseline=None, tolerance=0.2):
+    # type: (Context, Optional[str], str, int, int, str, Optional[str], float) -> None
+    """
+    Benchmark parse, part1 and part2 on synthetic inputs of 10^N records.
+    Day 4 also has the game timed apart from parsing, as the play stage.
+    Fails if any result is slower or takes more memory than the baseline by more than the tolerance.
+    Examples:
+        inv bench
+        inv bench -d 1 --sizes 3,4,5,6,7
+        inv bench --output bench_baseline.json
+        inv bench --baseline bench_baseline.json --tolerance 0.1
+    """
+    from bench import GENERATORS, find_regressions, load_results, run_benchmarks, save_results
+
+    if day:
+        if len(day) == 1:
+            day = "0" + day
+        days = [day]
+    else:
+        days = sorted(GENERATORS)
+
+    def print_result(day, size, stats):
+        # type: (str, int, dict[str, Any]) -> None
+        timings = "  ".join(
+            f"{stage} {stage_stats['min']:.4f}s" for stage, stage_stats in stats.items() if stage != "peak_memory"
+        )
+        print(f"day{day} size {size:>8}  {timings}  peak {stats['peak_memory'] / 2**20:.1f} MiB")
+
+    size_list = [10 ** int(exponent) for exponent in sizes.split(",")]
+    results = run_benchmarks(days, size_list, seed=seed, repeat=repeat, on_result=print_result)
+    save_results(output, results, seed=seed, repeat=repeat)
+    print(f"Saved the results to {output}")
+
+    if baseline:
+        regressions = find_regressions(results, load_results(baseline), tolerance)
+        if regressions:
+            print()
+            print("=== REGRESSIONS ===")
+            for regression in regressions:
+                print(regression)
+            raise SystemExit(1)
+        else:
+            print("=== NO REGRESSIONS ===")
+
+
 SOLUTION_TEMPLATE = """
 from typing import Any
 
-from common import read_input_txt
+from common import ensure_parsed, read_input_txt
 
 
-def part1(input_txt: str) -> Any:
+def parse(input_txt: str) -> Any:
     return None
 
 
-def part2(input_txt: str) -> Any:
-    return None
+def part1(input_txt: Any) -> Any:
+    return ensure_parsed(input_txt, parse)
+
+
+def part2(input_txt: Any) -> Any:
+    return ensure_parsed(input_txt, parse)
 
 
 def main() -> None:
     input_txt = read_input_txt(__file__)
+    parsed = parse(input_txt)
 
-    part1_answer = part1(input_txt)
+    part1_answer = part1(parsed)
     print("Part 1:", part1_answer)
 
-    part2_answer = part2(input_txt)
+    part2_answer = part2(parsed)
     print("Part 2:", part2_answer)
 """.strip()
 